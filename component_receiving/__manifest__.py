@@ -1,15 +1,17 @@
 {
     'name': 'Component Receiving',
-    'version': '1.0',
+    'version': '1.2',
     'author': 'Mohamed said',
     'depends': ['stock', 'product','product_custom_fields','repair_approval'],
     'data': [
         'security/ir.model.access.csv',
         'views/add_field _service_cat_stock_picking.xml',
+        'views/wizards_repair_order_buttons.xml',
         'views/stock_picking_logic.xml',
         'views/RO_logic.xml',
         'views/inherit_stock_picking_type.xml',
-        'views/wizards_repair_order_buttons.xml',
+        'views/ro_generation_job_views.xml',
+        'data/ir_cron_data.xml',
     ],
     'installable': True,
     'application': True,
@@ -0,0 +1,28 @@
+def migrate(cr, version):
+    """Backfill the new stored CR flags in SQL.
+
+    The columns are created and filled here, before the registry loads, so
+    the ORM finds them populated and does not recompute every picking.
+    """
+    if not version:
+        return
+
+    cr.execute("""
+        ALTER TABLE stock_picking
+            ADD COLUMN IF NOT EXISTS is_component_receiving boolean,
+            ADD COLUMN IF NOT EXISTS is_cr_receipt boolean
+    """)
+
+    cr.execute("""
+        UPDATE stock_picking p
+           SET is_component_receiving = COALESCE(t.is_component_receiving_enabled, FALSE)
+          FROM stock_picking_type t
+         WHERE t.id = p.cr_operation_type_id
+    """)
+
+    cr.execute("""
+        UPDATE stock_picking p
+           SET is_cr_receipt = (t.code = 'incoming' AND COALESCE(t.is_component_receiving_enabled, FALSE))
+          FROM stock_picking_type t
+         WHERE t.id = p.picking_type_id
+    """)
@@ -0,0 +1,18 @@
+def migrate(cr, version):
+    """Backfill the now stored stock.move service_category in SQL."""
+    if not version:
+        return
+
+    cr.execute("""
+        ALTER TABLE stock_move
+            ADD COLUMN IF NOT EXISTS service_category varchar
+    """)
+
+    cr.execute("""
+        UPDATE stock_move m
+           SET service_category = t.service_types
+          FROM product_product p
+          JOIN product_template t ON t.id = p.product_tmpl_id
+         WHERE p.id = m.product_id
+           AND t.service_types IS NOT NULL
+    """)
@@ -1,5 +1,7 @@
 from odoo import models, fields, api
 from odoo.exceptions import ValidationError
+from odoo.tools import sql
+from odoo.addons.repair_approval.models.perf_metrics import instrumented
 import logging
 
 _logger = logging.getLogger(__name__)
@@ -11,15 +13,15 @@ class StockPicking(models.Model):
     has_sale_access = fields.Boolean(compute="_compute_has_sale_access")
 
     def _compute_has_sale_access(self):
-        user = self.env.user
-        for rec in self:
-            rec.has_sale_access = user.has_group('sales_team.group_sale_salesman')
+        self.has_sale_access = self.env.user._can_act_as_sales()
 
     is_cr_receipt = fields.Boolean(
         compute="_compute_is_cr_receipt",
-        store=False
+        store=True,
+        index=True
     )
 
+    @api.depends("picking_type_id.code", "picking_type_id.is_component_receiving_enabled")
     def _compute_is_cr_receipt(self):
         for rec in self:
             rec.is_cr_receipt = bool(
@@ -31,156 +33,203 @@ class StockPicking(models.Model):
     cr_state = fields.Selection([
         ("draft", "Draft"),
         ("waiting_ro", "Waiting Create RO"),
+        ("generating", "Generating ROs"),
         ("ro_created", "RO Created"),
         ("cancel", "Cancelled"),  # ← NEW
-    ], default="draft")
-
-    # =====================================================
-    # Find Picking Type based on service category
-    # =====================================================
-    def _find_picking_type_for_service(self, service_category):
-        if not service_category:
-            return False
-
-        PickingType = self.env['stock.picking.type']
-
-        picking_type = PickingType.search([
-            ('select_service', '=', service_category)
-        ], limit=1)
-
-        return picking_type
+    ], default="draft", index=True)
+
+    def init(self):
+        super().init()
+        # hot queue: receipts waiting for the Sales Team
+        sql.create_index(
+            self._cr, "stock_picking_cr_waiting_ro_index", self._table,
+            ["id"], where="cr_state = 'waiting_ro'",
+        )
 
     # =====================================================
     # Create Repair Orders for each operation line
     # =====================================================
-    def _create_repair_orders(self):
+    @instrumented("component_receiving.create_repair_orders", records=lambda pickings: len(pickings.move_ids))
+    def _create_repair_orders(self, body=None):
+        """Create one Repair Order per move of the pickings, in batch.
+
+        A single chatter note per picking (``body`` or the default one) is
+        posted after commit.
+        """
+        shortages = self._get_spare_shortages(self.move_ids)
+        repairs = self._generate_repair_orders(self.move_ids)
+
+        for picking in self:
+            picking._post_ro_created_message(body, shortages.get(picking.id))
+
+        return repairs
+
+    def _post_ro_created_message(self, body=None, shortages=None):
+        body = body or "✔ Repair Orders created and Spare Parts added automatically."
+        if shortages:
+            body += "\n⚠ Spare parts short on stock: %s" % ", ".join(shortages)
+        self._cr_after_commit("message_post", body=body)
+
+    def _get_spare_shortages(self, moves):
+        """Pre-check: ``{picking_id: [spare names]}`` whose free stock is below the kit demand.
+
+        Uses the kit availability API, i.e. one grouped quant query for the
+        whole batch.
+        """
+        templates = moves.product_id.product_tmpl_id
+        kits = templates._get_spare_kits()
+        availability = templates._get_spare_kit_availability()
+
+        demand = {}
+        for move in moves:
+            for spare_product_id, _uom_id in kits[move.product_id.product_tmpl_id.id]:
+                demand[spare_product_id] = demand.get(spare_product_id, 0.0) + move.product_uom_qty
+
+        short_ids = {
+            product_id
+            for product_id, qty in demand.items()
+            if sum(free for _on_hand, _reserved, free in availability.get(product_id, {}).values()) < qty
+        }
+        if not short_ids:
+            return {}
+
+        names = {p.id: p.display_name for p in self.env["product.product"].browse(short_ids)}
+        shortages = {}
+        for move in moves:
+            for spare_product_id, _uom_id in kits[move.product_id.product_tmpl_id.id]:
+                if spare_product_id in short_ids:
+                    shortages.setdefault(move.picking_id.id, set()).add(names[spare_product_id])
+        return {picking_id: sorted(spares) for picking_id, spares in shortages.items()}
+
+    def _generate_repair_orders(self, moves):
+        """Create the Repair Orders (and their spare parts) for ``moves``.
+
+        Picking types and tags are resolved once per service category, the
+        Repair Orders are created with a single ``create(vals_list)`` and all
+        their spare-part moves with another one, so the number of queries
+        does not grow with the number of moves. Used for whole pickings and
+        for the chunks of the background generation jobs.
+        """
         Repair = self.env["repair.order"]
         Move = self.env["stock.move"].with_context(from_backend=True)  # ← أهم تعديل
 
-        for move in self.move_ids:
-
-            # Tag
-            tag = self._get_tag_from_service_category(move.service_category)
+        if not moves:
+            return Repair
 
-            picking_type = self._find_picking_type_for_service(move.service_category)
-            if not picking_type or not picking_type.sequence_id:
+        # Resolve picking type + tag once per service category
+        categories = {
+            category
+            for category, in self.env["stock.move"]._read_group(
+                [("id", "in", moves.ids)], ["service_category"]
+            )
+        }
+        service_types = self.env["stock.picking.type"]._get_service_picking_type_map()
+        picking_types = {}
+        for category in categories:
+            type_id, sequence_id = service_types.get(category, (False, False))
+            if not category or not type_id or not sequence_id:
                 raise ValidationError(
-                    f"No sequence defined on Picking Type for service category: {move.service_category}"
+                    f"No sequence defined on Picking Type for service category: {category}"
                 )
-            # Create Repair Order
-            ro = Repair.create({
+            picking_types[category] = type_id
+        tags = self._get_tags_from_service_categories(categories)
+
+        # Repair Orders
+        ro_vals_list = []
+        for move in moves:
+            picking = move.picking_id
+            vals = {
                 "product_id": move.product_id.id,
-                "partner_id": self.partner_id.id,
-                "location_id": self.location_id.id,
-                "location_dest_id": self.location_dest_id.id,
-                "picking_id": self.id,
-
-                # ⭐ أهم إضافة بناءً على طلبك
-                "picking_type_id": picking_type.id if picking_type else False,
-
+                "partner_id": picking.partner_id.id,
+                "location_id": picking.location_id.id,
+                "location_dest_id": picking.location_dest_id.id,
+                "picking_id": picking.id,
+                "picking_type_id": picking_types[move.service_category],
                 "product_qty": move.quantity,
-            })
-            # Apply tag
+            }
+            tag = tags.get(move.service_category)
             if tag:
-                ro.write({"tag_ids": [(4, tag.id)]})
-
-            # Spare Parts Lines
-            spare_lines = move.product_id.product_tmpl_id.spareparts_line_ids
-
-            for spare in spare_lines:
-                Move.create({
+                vals["tag_ids"] = [(4, tag.id)]
+            ro_vals_list.append(vals)
+
+        repairs = Repair.create(ro_vals_list)
+
+        # Spare Parts Lines (kits expanded for the whole batch at once)
+        kits = moves.product_id.product_tmpl_id._get_spare_kits()
+        spare_vals_list = []
+        for move, ro in zip(moves, repairs):
+            picking = move.picking_id
+            for spare_product_id, uom_id in kits[move.product_id.product_tmpl_id.id]:
+                spare_vals_list.append({
                     "repair_id": ro.id,
                     "repair_line_type": "add",
 
-                    "product_id": spare.spare_product_id.id,
+                    "product_id": spare_product_id,
 
                     # ← أهم جزئية:
                     "product_uom_qty": move.product_uom_qty,  # Demand
                     "quantity": move.quantity,  # Quantity Done
 
-                    "product_uom": spare.spare_product_id.uom_id.id,
-                    "location_id": self.location_id.id,
-                    "location_dest_id": self.location_dest_id.id,
-                    "company_id": self.company_id.id,
-                    "partner_id": self.partner_id.id,
+                    "product_uom": uom_id,
+                    "location_id": picking.location_id.id,
+                    "location_dest_id": picking.location_dest_id.id,
+                    "company_id": picking.company_id.id,
+                    "partner_id": picking.partner_id.id,
                 })
 
-        self.message_post(body="✔ Repair Orders created and Spare Parts added automatically.")
+        if spare_vals_list:
+            Move.create(spare_vals_list)
+
+        return repairs
+
+    # =====================================================
+    # Background generation (large receipts)
+    # =====================================================
+    def _use_async_ro_generation(self):
+        """Large receipts are queued when ``component_receiving.ro_async_min_moves`` is set."""
+        threshold = int(self.env["ir.config_parameter"].sudo().get_param(
+            "component_receiving.ro_async_min_moves", 0
+        ) or 0)
+        return bool(threshold) and len(self.move_ids) >= threshold
 
     # =====================================================
     # Create REAL Activities for Sales
     # =====================================================
+    @instrumented("component_receiving.assign_sales_activities")
     def _assign_sales_activities(self):
-        self.ensure_one()
-        _logger.info("📌 Assign Sales Activities for Picking: %s", self.name)
-
-        # كل جروبات الـ Sales
-        sales_groups_xmlids = [
-            "sales_team.group_sale_salesman",  # Own Documents Only
-            "sales_team.group_sale_salesman_all_leads",  # All Documents
-            "sales_team.group_sale_manager",  # Sales Administrator
-        ]
+        """Create the "Waiting Create RO" activities for every sales user.
 
-        # تحويل XMLIDs → IDs
-        sales_group_ids = []
-        for xmlid in sales_groups_xmlids:
-            try:
-                gid = self.env.ref(xmlid).id
-                sales_group_ids.append(gid)
-                _logger.info("📌 Added Sales Group: %s = %s", xmlid, gid)
-            except:
-                _logger.warning("⚠️ Group not found: %s", xmlid)
-
-        if not sales_group_ids:
-            _logger.warning("⚠️ No Sales groups found at all!")
+        All activities of all pickings are created with one
+        ``create(vals_list)``. With ``component_receiving.sales_activity_digest``
+        enabled, each sales user keeps a single rolling activity instead.
+        """
+        if not self:
             return
+        _logger.info("📌 Assign Sales Activities for Pickings: %s", self.mapped("name"))
 
-        # البحث عن المستخدمين اللي داخل أي جروب من دول
-        self.env.cr.execute("""
-            SELECT DISTINCT uid 
-            FROM res_groups_users_rel 
-            WHERE gid IN %s
-        """, (tuple(sales_group_ids),))
+        users = self.env["res.users"]._get_sales_recipients()
 
-        user_ids = [row[0] for row in self.env.cr.fetchall()]
-        _logger.info("📌 Raw Sales Users IDs: %s", user_ids)
+        _logger.info("📌 Final Sales Users: %s", users.ids)
 
-        if not user_ids:
-            _logger.warning("⚠️ No Sales users assigned to any Sales group!")
+        if not users:
+            _logger.warning("⚠️ No valid Sales users found!")
             return
 
-        users = self.env["res.users"].browse(user_ids)
-
-        # ================================
-        # 🚫 استبعاد OdooBot + Root User
-        # ================================
-        exclude_ids = []
-        for bot in ["base.user_odoo_bot", "base.user_root"]:
-            try:
-                exclude_ids.append(self.env.ref(bot).id)
-            except:
-                pass
-
-        users = users.filtered(lambda u: u.id not in exclude_ids)
-
-        _logger.info("📌 Final Sales Users (after filtering bot/root): %s", users.ids)
-
-        if not users:
-            _logger.warning("⚠️ No valid Sales users left after filtering!")
+        if self._use_sales_activity_digest():
+            self._refresh_sales_activity_digest()
             return
 
         # إنشاء Activity
-        Activity = self.env['mail.activity']
-        activity_type = self.env.ref("mail.mail_activity_data_todo")
-
-        for user in users:
-            Activity.create({
-                "res_id": self.id,
-                "res_model_id": self.env.ref("stock.model_stock_picking").id,
-                "activity_type_id": activity_type.id,
-                "summary": "Waiting Create RO",
-                "user_id": user.id,
-                "note": """
+        activity_type_id = self.env.ref("mail.mail_activity_data_todo").id
+        model_id = self.env["ir.model"]._get_id("stock.picking")
+
+        self.env['mail.activity'].create([{
+            "res_id": picking.id,
+            "res_model_id": model_id,
+            "activity_type_id": activity_type_id,
+            "summary": "Waiting Create RO",
+            "user_id": user.id,
+            "note": """
                     👋 <b>Dear Sales Team,</b><br/><br/>
 
                     A Component Receipt has been completed and requires your action.<br/>
@@ -189,10 +238,115 @@ class StockPicking(models.Model):
                     📌 <b>Picking:</b> %s <br/><br/>
 
                     Thank you for your prompt attention.
-                """ % (self.name),
+                """ % (picking.name),
 
-            })
-            _logger.info("✔ Activity Created for Sales User: %s", user.name)
+        } for picking in self for user in users])
+        _logger.info("✔ %s Activities Created for %s Sales Users", len(self) * len(users), len(users))
+
+    # =====================================================
+    # Digest mode: one rolling activity per sales user
+    # =====================================================
+    _SALES_DIGEST_SUMMARY = "Waiting Create RO (Digest)"
+    _SALES_DIGEST_MAX_LINES = 100
+
+    @api.model
+    def _use_sales_activity_digest(self):
+        return bool(self.env["ir.config_parameter"].sudo().get_param(
+            "component_receiving.sales_activity_digest", False
+        ))
+
+    @api.model
+    def _refresh_sales_activity_digest(self):
+        """Bring the sales digests up to date after pickings entered or left the queue.
+
+        Each digest shows the number of pickings waiting for an RO and the
+        oldest ones, and is attached to the oldest one. The cost does not
+        depend on the size of the queue: one count and one bounded search.
+        ``res_id`` only moves when its picking stopped waiting, users
+        without a digest get one, and digests of users who are no longer
+        sales recipients are removed.
+        """
+        users = self.env["res.users"]._get_sales_recipients()
+        Activity = self.env["mail.activity"]
+        digest_domain = [
+            ("res_model", "=", self._name),
+            ("summary", "=", self._SALES_DIGEST_SUMMARY),
+        ]
+
+        waiting_domain = [("cr_state", "=", "waiting_ro")]
+        waiting_count = self.search_count(waiting_domain)
+        if not waiting_count:
+            Activity._unlink_system_activities(digest_domain)
+            return
+
+        Activity._unlink_system_activities(digest_domain + [("user_id", "not in", users.ids)])
+        digests = Activity.search(digest_domain)
+
+        oldest = self.search(waiting_domain, order="id", limit=self._SALES_DIGEST_MAX_LINES)
+        lines = "".join(f"<li>{name}</li>" for name in oldest.mapped("name"))
+        if waiting_count > len(oldest):
+            lines += f"<li>… and {waiting_count - len(oldest):,} more</li>"
+
+        vals = {
+            "date_deadline": fields.Date.context_today(self),
+            "note": f"""
+                    👋 <b>Dear Sales Team,</b><br/><br/>
+
+                    {waiting_count:,} Component Receipts are waiting for their Repair Orders:<br/>
+                    <ul>{lines}</ul>
+                """,
+        }
+        digests.with_context(mail_activity_quick_update=True).write(vals)
+
+        attached = self.browse(set(digests.mapped("res_id"))).filtered(lambda p: p.cr_state == "waiting_ro")
+        detached = digests.filtered(lambda a: a.res_id not in attached.ids)
+        if detached:
+            detached.with_context(mail_activity_quick_update=True).write({"res_id": oldest[0].id})
+
+        missing_users = users - digests.user_id
+        if missing_users:
+            Activity.create([{
+                **vals,
+                "res_id": oldest[0].id,
+                "res_model_id": self.env["ir.model"]._get_id(self._name),
+                "activity_type_id": self.env.ref("mail.mail_activity_data_todo").id,
+                "summary": self._SALES_DIGEST_SUMMARY,
+                "user_id": user.id,
+            } for user in missing_users])
+
+    # =====================================================
+    # Auto-resolution of "Waiting Create RO" activities
+    # =====================================================
+    def _close_waiting_ro_activities(self):
+        """Drop the "Waiting Create RO" activities of these pickings."""
+        self.env["mail.activity"]._unlink_system_activities([
+            ("res_model", "=", self._name),
+            ("res_id", "in", self.ids),
+            ("summary", "=", "Waiting Create RO"),
+        ])
+
+        if self._use_sales_activity_digest():
+            self._refresh_sales_activity_digest()
+
+    @api.model
+    def _cron_sweep_waiting_ro_activities(self):
+        """Drop "Waiting Create RO" activities of pickings that no longer wait."""
+        self.flush_model(["cr_state"])
+        self.env["mail.activity"].flush_model()
+        remaining = self.env["mail.activity"]._sweep_stale_activities("""
+            SELECT a.id
+              FROM mail_activity a
+         LEFT JOIN stock_picking p ON p.id = a.res_id
+             WHERE a.res_model = 'stock.picking'
+               AND a.summary = 'Waiting Create RO'
+               AND (p.id IS NULL OR p.cr_state IS DISTINCT FROM 'waiting_ro')
+          ORDER BY a.id
+             LIMIT %(limit)s
+        """)
+        if remaining:
+            self.env.ref("component_receiving.ir_cron_sweep_waiting_ro_activities")._trigger()
+        elif self._use_sales_activity_digest():
+            self._refresh_sales_activity_digest()
 
     # =====================================================
     # Wizard 1 Button
@@ -204,7 +358,7 @@ class StockPicking(models.Model):
             "res_model": "cr.repair.decision.wizard",
             "view_mode": "form",
             "target": "new",
-            "context": {"active_id": self.id},
+            "context": {"active_id": self.id, "active_ids": self.ids, "active_model": self._name},
         }
 
 
@@ -218,14 +372,17 @@ class StockPicking(models.Model):
             "res_model": "cr.create.ro.wizard",
             "view_mode": "form",
             "target": "new",
-            "context": {"active_id": self.id},
+            "context": {"active_id": self.id, "active_ids": self.ids, "active_model": self._name},
         }
 
     # =====================================================
     # create notification
     # =====================================================
     def _notify_ro_created(self):
-        message = f"Repair Orders have been created for picking '{self.name}'."
+        if len(self) == 1:
+            message = f"Repair Orders have been created for picking '{self.name}'."
+        else:
+            message = f"Repair Orders have been created for {len(self):,} pickings."
 
         self.env['bus.bus']._sendone(
             self.env.user.partner_id,
@@ -237,28 +394,97 @@ class StockPicking(models.Model):
             }
         )
 
-    def _get_tag_from_service_category(self, category_value):
-        """Create or fetch tag using FULL Service Category label."""
-        if not category_value:
-            return False
-
-        Move = self.env['stock.move']
+    def _get_tags_from_service_categories(self, categories):
+        """Return ``{category: tag}`` using the FULL Service Category label."""
+        categories = {category for category in categories if category}
+        if not categories:
+            return {}
 
         # Get selection list safely across all Odoo versions
-        selection = Move._fields['service_category']._description_selection(self.env)
+        selection = dict(self.env['stock.move']._fields['service_category']._description_selection(self.env))
 
         # Convert value → label
-        label = dict(selection).get(category_value, category_value)
+        labels = {category: selection.get(category, category) for category in categories}
+
+        tags = self.env["repair.tags"]._get_or_create_by_names(labels.values())
+        return {category: tags[label] for category, label in labels.items() if label in tags}
+
+    # =====================================================
+    # Wizards: target pickings + mass RO generation
+    # =====================================================
+    @api.model
+    def _get_cr_wizard_pickings(self, eligible):
+        """Return the pickings selected in the wizard context that ``eligible`` accepts."""
+        ctx = self.env.context
+        ids = ctx.get("active_ids") or ([ctx["active_id"]] if ctx.get("active_id") else [])
+        pickings = self.browse(ids).exists().filtered(eligible)
+        if not pickings:
+            raise ValidationError("None of the selected Component Receipts can be processed at this stage.")
+        return pickings
+
+    def _generate_repair_orders_for_pickings(self, body):
+        """YES / Create path for any number of pickings.
+
+        Large receipts are queued for background generation; the others are
+        generated in one batch, moved to "RO Created" with a single write and
+        reported with a single bus notification.
+        """
+        queued = self.filtered(lambda p: p._use_async_ro_generation())
+        if queued:
+            self.env["cr.ro.generation.job"]._enqueue(queued, body)
+
+        pickings = self - queued
+        if not pickings:
+            return
 
-        Tag = self.env["repair.tags"]
+        # prefetch moves + products for every picking at once (kits come from _get_spare_kits)
+        pickings.mapped("move_ids.product_id.product_tmpl_id")
 
-        # Search by full label
-        tag = Tag.search([("name", "=", label)], limit=1)
+        # ✔ Log Note واضحة (one per picking, after commit)
+        pickings._create_repair_orders(body)
+        pickings.write({"cr_state": "ro_created"})
+        pickings._cr_after_commit("_notify_ro_created")
+        pickings._cr_after_commit("_close_waiting_ro_activities")
 
-        if not tag:
-            tag = Tag.create({"name": label})
+    # =====================================================
+    # Post-commit side effects (chatter / bus / activities)
+    # =====================================================
+    _CR_SIDE_EFFECTS = "component_receiving.side_effects"
+
+    def _cr_after_commit(self, method, *args, **kwargs):
+        """Run ``self.method(*args, **kwargs)`` once the transaction is committed.
+
+        Chatter notes, bus notifications and activities of the CR flow are
+        collected here and dispatched together in a fresh transaction, so
+        they do not extend the locks held on pickings and sequences, and are
+        dropped if the transaction rolls back. With the context key
+        ``cr_inline_side_effects`` (tests, scripts) they run immediately.
+        """
+        if self.env.context.get("cr_inline_side_effects"):
+            return getattr(self, method)(*args, **kwargs)
+
+        postcommit = self.env.cr.postcommit
+        if self._CR_SIDE_EFFECTS not in postcommit.data:
+            postcommit.data[self._CR_SIDE_EFFECTS] = []
+            postcommit.add(self._dispatch_cr_side_effects)
+
+        postcommit.data[self._CR_SIDE_EFFECTS].append(
+            (self._name, self.ids, self.env.uid, dict(self.env.context), method, args, kwargs)
+        )
 
-        return tag
+    def _dispatch_cr_side_effects(self):
+        effects = self.env.cr.postcommit.data.get(self._CR_SIDE_EFFECTS)
+        if not effects:
+            return
+
+        with self.env.registry.cursor() as cr:
+            for model, ids, uid, context, method, args, kwargs in effects:
+                env = api.Environment(cr, uid, context)
+                try:
+                    with cr.savepoint():
+                        getattr(env[model].browse(ids), method)(*args, **kwargs)
+                except Exception:
+                    _logger.exception("CR side effect %s.%s failed for %s", model, method, ids)
 
     def copy(self, default=None):
         default = dict(default or {})
@@ -280,23 +506,22 @@ class CRRepairDecisionWizard(models.TransientModel):
     ], required=True)
 
     def action_confirm(self):
-        picking = self.env["stock.picking"].browse(self.env.context.get("active_id"))
+        pickings = self.env["stock.picking"]._get_cr_wizard_pickings(
+            lambda p: p.is_cr_document and p.state == "done" and p.cr_state == "draft"
+        )
 
         if self.option == "yes":
-            picking._create_repair_orders()
-            picking.write({'cr_state': 'ro_created'})
-            picking._notify_ro_created()
-            # ✔ Log Note واضحة
-            picking.message_post(body="""
+            pickings._generate_repair_orders_for_pickings("""
                      ✔ Repair Orders Created Automatically
                      System generated the Repair Order because the Component Receipt was confirmed as received.
                  """)
 
         else:
-            picking.write({'cr_state': 'waiting_ro'})
-            picking._assign_sales_activities()
-            # ✔ Log note تشرح المطلوب
-            picking.message_post(body="""
+            pickings.write({'cr_state': 'waiting_ro'})
+            pickings._cr_after_commit("_assign_sales_activities")
+            for picking in pickings:
+                # ✔ Log note تشرح المطلوب
+                picking._cr_after_commit("message_post", body="""
                       ⚠ Repair Order Not Received Yet
                       Component Receipt moved to Waiting Create RO
                       Sales Team is required to create the Repair Order manually.
@@ -319,23 +544,24 @@ class CRCreateROWizard(models.TransientModel):
 
     def action_confirm(self):
         # VALIDATION: Only Sales allowed
-        if not self.env.user.has_group("sales_team.group_sale_salesman"):
+        if not self.env.user._can_act_as_sales():
             raise ValidationError("❌ Only the Sales Team can perform this action.")
 
-        picking = self.env["stock.picking"].browse(self.env.context.get("active_id"))
+        pickings = self.env["stock.picking"]._get_cr_wizard_pickings(
+            lambda p: p.is_cr_document and p.cr_state == "waiting_ro"
+        )
 
         if self.option == "create":
-            picking._create_repair_orders()
-            picking.write({"cr_state": "ro_created"})
-            picking._notify_ro_created()  # ← NEW
-            picking.message_post(body=f"""
+            pickings._generate_repair_orders_for_pickings(f"""
                           ✔ Repair Orders Created by Sales Team
                           User {self.env.user.name} created the Repair Orders manually from the Waiting Stage.
                       """)
 
         else:
-            picking.write({"cr_state": "cancel"})  # ← بدل action_cancel
-            picking.message_post(body=f"""
+            pickings.write({"cr_state": "cancel"})  # ← بدل action_cancel
+            pickings._cr_after_commit("_close_waiting_ro_activities")
+            for picking in pickings:
+                picking._cr_after_commit("message_post", body=f"""
                            ❌ Component Receipt Cancelled
                            Action performed by user {self.env.user.name}.
                        """)
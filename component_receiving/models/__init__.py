@@ -3,3 +3,5 @@ from . import stock_picking_component_receiving
 from . import inherit_stock_move
 from . import RO_logic
 from . import inherit_stock_picking_type
+from . import inherit_repair_tags
+from . import ro_generation_job
@@ -10,18 +10,20 @@ class StockPicking(models.Model):
     # ============================================================
     is_cr_document = fields.Boolean(
         string="Is Component Receipt Document",
-        default=False
+        default=False,
+        index=True
     )
 
     # ============================================================
-    # 2) Computed flag (view logic only)
+    # 2) Computed flag (stored → usable in domains)
     # ============================================================
     is_component_receiving = fields.Boolean(
         compute="_compute_is_component_receiving",
-        store=False
+        store=True,
+        index=True
     )
 
-    @api.depends("cr_operation_type_id")
+    @api.depends("cr_operation_type_id", "cr_operation_type_id.is_component_receiving_enabled")
     def _compute_is_component_receiving(self):
         """يحدد هل هذا الاستلام Component Receipt."""
         for rec in self:
@@ -57,65 +59,71 @@ class StockPicking(models.Model):
 
     # ============================================================
     # 4) VALIDATION: Owner must equal Partner
+    #    (field-scoped: only when these fields change, CR only)
     # ============================================================
+    @api.constrains('partner_id', 'owner_id', 'cr_operation_type_id')
     def _validate_owner_partner_match(self):
-        for rec in self:
-            if rec.is_component_receiving:
-                if rec.owner_id.id != rec.partner_id.id:
-                    raise ValidationError(
-                        "Assign Owner must match Receive From inside Component Receiving!"
-                    )
+        for rec in self.filtered('is_component_receiving'):
+            if rec.owner_id.id != rec.partner_id.id:
+                raise ValidationError(
+                    "Assign Owner must match Receive From inside Component Receiving!"
+                )
 
     # ============================================================
     # 5) VALIDATION: Origin required
     # ============================================================
+    @api.constrains('origin', 'cr_operation_type_id')
     def _validate_origin_required(self):
-        for rec in self:
-            if rec.is_component_receiving:
-                if not rec.origin or not rec.origin.strip():
-                    raise ValidationError(
-                        "Source Document is required in Component Receiving!"
-                    )
+        for rec in self.filtered('is_component_receiving'):
+            if not rec.origin or not rec.origin.strip():
+                raise ValidationError(
+                    "Source Document is required in Component Receiving!"
+                )
 
     # ============================================================
-    # 6) CREATE override
+    # 6) CREATE pipeline (single batched override)
     # ============================================================
-    @api.model
+    @api.model_create_multi
     def create(self, vals_list):
+        """Apply the CR defaults and pre-checks to all vals in one pass.
+
+        Every referenced CR operation type is read at once and the default
+        receipt type is resolved at most once, so the cost of importing or
+        duplicating receipts does not depend on per-record queries.
+        """
+        in_cr_view = self._context.get("is_component_receipt")
 
-        # normalize input → always a list
-        if isinstance(vals_list, dict):
-            vals_list = [vals_list]
+        type_ids = {vals["cr_operation_type_id"] for vals in vals_list if vals.get("cr_operation_type_id")}
+        cr_enabled_ids = set(
+            self.env["stock.picking.type"].browse(type_ids).filtered("is_component_receiving_enabled").ids
+        )
+        default_type_id = None
 
+        new_vals_list = []
         for vals in vals_list:
+            vals = dict(vals)
+
+            # REQUIRED ONLY IN COMPONENT RECEIPT
+            if vals.get("is_component_receipt") and not vals.get("cr_operation_type_id"):
+                raise ValidationError("CR Operation Type is required in Component Receiving!")
 
             # لو الشاشة الحالية هي Component Receiving
-            if self._context.get("is_component_receipt"):
+            if in_cr_view:
                 vals["is_cr_document"] = True     # سجّل أن هذا record تابع CR
 
-            # VALIDATION قبل الإنشاء
-            if vals.get("cr_operation_type_id"):
-                ptype = self.env["stock.picking.type"].browse(vals["cr_operation_type_id"])
-                if ptype.is_component_receiving_enabled and not vals.get("origin"):
+            # VALIDATION قبل الإنشاء + sync picking type
+            cr_type_id = vals.get("cr_operation_type_id")
+            if cr_type_id:
+                if cr_type_id in cr_enabled_ids and not vals.get("origin"):
                     raise ValidationError("Source Document is required in Component Receiving!")
+                vals["picking_type_id"] = cr_type_id
 
-        # تابع الإنشاء
-        records = super().create(vals_list)
-
-        # VALIDATIONS بعد الإنشاء
-        for rec in records:
-            rec._validate_owner_partner_match()
-            rec._validate_origin_required()
-
-        return records
-
-    # ============================================================
-    # 7) WRITE override
-    # ============================================================
-    def write(self, vals):
-        result = super().write(vals)
+            if not vals.get("picking_type_id"):
+                if default_type_id is None:
+                    default_type_id = self.env.ref("stock.picking_type_in").id
+                vals["picking_type_id"] = default_type_id
 
-        self._validate_owner_partner_match()
-        self._validate_origin_required()
+            new_vals_list.append(vals)
 
-        return result
+        # تابع الإنشاء (the constraints above validate the new records)
+        return super().create(new_vals_list)
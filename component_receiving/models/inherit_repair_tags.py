@@ -0,0 +1,41 @@
+from odoo import models, api
+
+
+# -------------------------------------------------------------
+# Repair Tags – Bulk, concurrency-safe get-or-create
+# -------------------------------------------------------------
+class RepairTags(models.Model):
+    _inherit = "repair.tags"
+
+    @api.model
+    def _get_or_create_by_names(self, names):
+        """Return ``{name: tag}`` for ``names``, creating the missing tags.
+
+        Missing tags are inserted with ``ON CONFLICT (name) DO NOTHING`` on the
+        ``name_uniq`` constraint of ``repair.tags``, so two workers resolving
+        the same name can never create it twice: if the other one commits
+        first, the insert raises a serialization failure and Odoo retries
+        the whole transaction. Ids are never memoized across calls: a tag
+        created under a savepoint that is rolled back must not be returned.
+        """
+        names = list({name for name in names if name})
+        if not names:
+            return {}
+
+        self.flush_model(["name"])
+        # existing rows come from the table, new ones from RETURNING
+        self.env.cr.execute("""
+            WITH new_tags AS (
+                INSERT INTO repair_tags (name, color, create_uid, create_date, write_uid, write_date)
+                SELECT name, floor(random() * 11 + 1)::int,
+                       %(uid)s, now() at time zone 'UTC',
+                       %(uid)s, now() at time zone 'UTC'
+                  FROM unnest(%(names)s::varchar[]) AS name
+                ON CONFLICT (name) DO NOTHING
+                RETURNING id, name
+            )
+            SELECT id, name FROM new_tags
+             UNION ALL
+            SELECT id, name FROM repair_tags WHERE name = ANY(%(names)s)
+        """, {"uid": self.env.uid, "names": names})
+        return {name: self.browse(tag_id) for tag_id, name in self.env.cr.fetchall()}
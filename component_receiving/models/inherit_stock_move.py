@@ -4,9 +4,11 @@ from odoo.exceptions import ValidationError
 class StockMove(models.Model):
     _inherit = 'stock.move'
 
+    # stored + indexed: usable for SQL grouping / filtering (receiving reports)
     service_category = fields.Selection(
         related='product_id.service_types',
         string="Service Category",
         readonly=True,
-        store=False,
+        store=True,
+        index=True,
     )
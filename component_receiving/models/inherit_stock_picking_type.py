@@ -1,5 +1,6 @@
-from odoo import models, fields, api
+from odoo import models, fields, api, tools
 from odoo.exceptions import ValidationError
+from odoo.tools import frozendict
 
 
 # -------------------------------------------------------------
@@ -49,3 +50,65 @@ class StockPickingType(models.Model):
                         f"❌ Operation Type '{exists.name}' is already assigned to service '{dict(self._fields['select_service'].selection).get(rec.select_service)}'.\n"
                         f"You cannot assign the same service to more than one Operation Type."
                     )
+
+    # ---------------------------------------------------------
+    # Service Category → Picking Type (registry cache)
+    # ---------------------------------------------------------
+    @api.model
+    @tools.ormcache()
+    def _get_service_picking_type_map(self):
+        """Return ``{service_category: (picking_type_id, sequence_id)}``.
+
+        ``_check_unique_service`` guarantees at most one operation type per
+        category, so the map is built with a single search and shared by the
+        whole registry until a service, sequence or active flag changes.
+        """
+        types = self.sudo().with_context(active_test=True).search([
+            ('select_service', '!=', False)
+        ])
+        return frozendict({
+            t.select_service: (t.id, t.sequence_id.id)
+            for t in types
+        })
+
+    # ---------------------------------------------------------
+    # CR-enabled operation types (per-transaction memo)
+    # ---------------------------------------------------------
+    _CR_ENABLED_MEMO = 'component_receiving.cr_enabled_type_ids'
+
+    @api.model
+    def _get_cr_enabled_type_ids(self):
+        """Ids of the CR-enabled operation types, searched once per transaction."""
+        memo = self.env.cr.precommit.data.setdefault(self._CR_ENABLED_MEMO, {})
+        key = (self.env.uid, tuple(self.env.companies.ids))
+        if key not in memo:
+            memo[key] = tuple(self.search([('is_component_receiving_enabled', '=', True)]).ids)
+        return memo[key]
+
+    _SERVICE_MAP_FIELDS = ('select_service', 'sequence_id', 'active')
+    _CR_ENABLED_FIELDS = ('is_component_receiving_enabled', 'active', 'company_id')
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        records = super().create(vals_list)
+        if any(vals.get('select_service') for vals in vals_list):
+            self.env.registry.clear_cache()
+        if any(vals.get('is_component_receiving_enabled') for vals in vals_list):
+            self.env.cr.precommit.data.pop(self._CR_ENABLED_MEMO, None)
+        return records
+
+    def write(self, vals):
+        res = super().write(vals)
+        if any(field in vals for field in self._SERVICE_MAP_FIELDS):
+            self.env.registry.clear_cache()
+        if any(field in vals for field in self._CR_ENABLED_FIELDS):
+            self.env.cr.precommit.data.pop(self._CR_ENABLED_MEMO, None)
+        return res
+
+    def unlink(self):
+        has_service = any(self.mapped('select_service'))
+        res = super().unlink()
+        if has_service:
+            self.env.registry.clear_cache()
+        self.env.cr.precommit.data.pop(self._CR_ENABLED_MEMO, None)
+        return res
@@ -0,0 +1,197 @@
+import logging
+
+from psycopg2 import errors
+
+from odoo import models, fields, api
+from odoo.addons.repair_approval.models.batching import committed_chunks
+from odoo.addons.repair_approval.models.perf_metrics import instrumented
+
+_logger = logging.getLogger(__name__)
+
+# transient errors: the job stays pending and the next cron run resumes it
+PG_CONCURRENCY_ERRORS = (errors.SerializationFailure, errors.LockNotAvailable, errors.DeadlockDetected)
+
+
+# ==========================================================
+# Background Repair Order generation for large receipts
+# ==========================================================
+class CRROGenerationJob(models.Model):
+    _name = "cr.ro.generation.job"
+    _description = "CR — Repair Order Generation Job"
+    _order = "id"
+
+    picking_id = fields.Many2one(
+        "stock.picking",
+        string="Component Receipt",
+        required=True,
+        index=True,
+        ondelete="cascade"
+    )
+
+    user_id = fields.Many2one(
+        "res.users",
+        string="Requested By",
+        default=lambda self: self.env.user
+    )
+
+    state = fields.Selection([
+        ("pending", "Pending"),
+        ("done", "Done"),
+        ("failed", "Failed"),
+    ], default="pending", required=True, index=True)
+
+    # checkpoint: moves are processed in id order, chunk by chunk
+    last_move_id = fields.Integer("Last Processed Move", default=0)
+    processed_count = fields.Integer("Processed Moves", default=0)
+    total_count = fields.Integer("Total Moves", default=0)
+
+    message_body = fields.Text("Completion Message")
+    error = fields.Text()
+
+    # parallel workers: crons running _cron_process_jobs (deactivate some to
+    # run fewer)
+    _WORKER_CRONS = (
+        "component_receiving.ir_cron_cr_ro_generation",
+        "component_receiving.ir_cron_cr_ro_generation_2",
+        "component_receiving.ir_cron_cr_ro_generation_3",
+    )
+
+    @api.model
+    def _trigger_workers(self):
+        for xmlid in self._WORKER_CRONS:
+            cron = self.env.ref(xmlid, raise_if_not_found=False)
+            if cron:
+                cron._trigger()
+
+    # =====================================================
+    # Enqueue (called by the wizards)
+    # =====================================================
+    @api.model
+    def _enqueue(self, pickings, message_body=False):
+        jobs = self.sudo().create([{
+            "picking_id": picking.id,
+            "total_count": len(picking.move_ids),
+            "message_body": message_body,
+        } for picking in pickings])
+
+        pickings.write({"cr_state": "generating"})
+        for picking in pickings:
+            picking._cr_after_commit("message_post", body="⏳ Repair Orders are being generated in the background.")
+
+        self._trigger_workers()
+        return jobs
+
+    # =====================================================
+    # Cron: drain the queue chunk by chunk
+    # =====================================================
+    @api.model
+    def _cron_process_jobs(self, max_chunks=50):
+        """Process up to ``max_chunks`` chunks, committing after each one.
+
+        Every worker cron runs this method: ``FOR UPDATE SKIP LOCKED`` hands
+        each of them a different job, and the checkpoint on the job makes a
+        killed worker resume where the last committed chunk stopped. A
+        failing chunk is rolled back and fails its job; a concurrency error
+        (another worker just moved the job on) leaves it pending instead.
+        """
+        for _chunk in committed_chunks(self.env.cr, max_chunks):
+            job = self.browse()
+            try:
+                with self.env.cr.savepoint():
+                    job = self._lock_next_job()
+                    if job:
+                        job._process_chunk()
+            except PG_CONCURRENCY_ERRORS as e:
+                _logger.info("Repair Order generation job %s postponed: %s", job.ids, e.pgcode)
+                break
+            except Exception as e:
+                if not job:
+                    raise
+                _logger.exception("Repair Order generation failed for job %s", job.id)
+                job._mark_failed(str(e))
+
+            if not job:
+                return
+
+        # budget exhausted or postponed: run again as soon as possible if work remains
+        if self.search_count([("state", "=", "pending")], limit=1):
+            self._trigger_workers()
+
+    @api.model
+    def _lock_next_job(self):
+        self.env.cr.execute("""
+            SELECT id
+              FROM cr_ro_generation_job
+             WHERE state = 'pending'
+          ORDER BY id
+             LIMIT 1
+               FOR UPDATE SKIP LOCKED
+        """)
+        row = self.env.cr.fetchone()
+        return self.browse(row[0]) if row else self.browse()
+
+    @api.model
+    def _get_chunk_size(self):
+        return int(self.env["ir.config_parameter"].sudo().get_param(
+            "component_receiving.ro_generation_chunk_size", 100
+        ) or 100)
+
+    @instrumented(
+        "component_receiving.ro_generation_chunk",
+        records=lambda job: min(job.total_count - job.processed_count, job._get_chunk_size()),
+    )
+    def _process_chunk(self):
+        self.ensure_one()
+        picking = self.picking_id
+
+        moves = self.env["stock.move"].search([
+            ("picking_id", "=", picking.id),
+            ("id", ">", self.last_move_id),
+        ], order="id", limit=self._get_chunk_size())
+
+        if not moves:
+            self._mark_done()
+            return
+
+        picking.with_user(self.user_id)._generate_repair_orders(moves)
+        self.write({
+            "last_move_id": moves[-1].id,
+            "processed_count": self.processed_count + len(moves),
+        })
+
+    def _mark_done(self):
+        self.ensure_one()
+        picking = self.picking_id.with_user(self.user_id)
+
+        # same pre-check as the inline generation, on the whole receipt
+        shortages = picking._get_spare_shortages(picking.move_ids)
+        picking.write({"cr_state": "ro_created"})
+        picking._post_ro_created_message(self.message_body, shortages.get(picking.id))
+        picking._cr_after_commit("_notify_ro_created")
+        picking._cr_after_commit("_close_waiting_ro_activities")
+
+        self.state = "done"
+
+    def _mark_failed(self, error):
+        """Stop the job and keep its checkpoint; the picking stays in
+        "generating" so the already committed chunks are never created twice."""
+        self.ensure_one()
+        picking = self.picking_id
+
+        picking.message_post(body=f"❌ Repair Order generation failed: {error}")
+        self.env["bus.bus"]._sendone(
+            self.user_id.partner_id,
+            "simple_notification",
+            {
+                "message": f"Repair Order generation failed for picking '{picking.name}'.",
+                "type": "danger",
+                "sticky": True,
+            }
+        )
+
+        self.write({"state": "failed", "error": error})
+
+    def action_retry(self):
+        self.filtered(lambda j: j.state == "failed").write({"state": "pending", "error": False})
+        self._trigger_workers()
+        return True
@@ -13,7 +13,8 @@ class StockPicking(models.Model):
         'stock.picking.type',
         string="CR Operation Type",
         required=1,
-        domain="[('id', 'in', allowed_cr_picking_type_ids)]"
+        index=True,
+        domain="is_cr_view and [('id', 'in', allowed_cr_picking_type_ids)] or []"
     )
 
     # قائمة العمليات المسموح بها داخل CR فقط
@@ -38,18 +39,16 @@ class StockPicking(models.Model):
 
     # ---------------------------------------------------------
     # Allowed operation types ONLY inside CR view
+    # (one lookup per batch; empty — i.e. unrestricted — outside CR)
     # ---------------------------------------------------------
-    @api.depends('picking_type_id')
+    @api.depends_context('is_component_receipt')
     def _compute_allowed_cr_types(self):
-        Type = self.env['stock.picking.type']
+        if not self._context.get("is_component_receipt", False):
+            self.allowed_cr_picking_type_ids = False
+            return
 
-        for rec in self:
-            if rec._context.get("is_component_receipt", False):
-                rec.allowed_cr_picking_type_ids = Type.search([
-                    ('is_component_receiving_enabled', '=', True)
-                ])
-            else:
-                rec.allowed_cr_picking_type_ids = Type.search([])
+        Type = self.env['stock.picking.type']
+        self.allowed_cr_picking_type_ids = Type.browse(Type._get_cr_enabled_type_ids())
 
     # ---------------------------------------------------------
     # Sync CR Operation Type → picking_type_id
@@ -59,50 +58,14 @@ class StockPicking(models.Model):
         if self.is_cr_view and self.cr_operation_type_id:
             self.picking_type_id = self.cr_operation_type_id
 
-    # ---------------------------------------------------------
-    # CREATE Override
-    # ---------------------------------------------------------
-    @api.model
-    def create(self, vals):
-        # لو Odoo أرسل list بدل dict
-        if isinstance(vals, list):
-            new_vals_list = []
-            for v in vals:
-                processed = v.copy()
-
-                # REQUIRED ONLY IN COMPONENT RECEIPT
-                if processed.get("is_component_receipt") and not processed.get("cr_operation_type_id"):
-                    raise ValidationError("CR Operation Type is required in Component Receiving!")
-
-                if processed.get('cr_operation_type_id'):
-                    processed['picking_type_id'] = processed['cr_operation_type_id']
-
-                if not processed.get('picking_type_id'):
-                    processed['picking_type_id'] = self.env.ref('stock.picking_type_in').id
-
-                new_vals_list.append(processed)
-
-            return super().create(new_vals_list)
-
-        # الحالة الطبيعية dict
-        vals = vals.copy()
-
-        # REQUIRED ONLY IN COMPONENT RECEIPT
-        if vals.get("is_component_receipt") and not vals.get("cr_operation_type_id"):
-            raise ValidationError("CR Operation Type is required in Component Receiving!")
-
-        if vals.get('cr_operation_type_id'):
-            vals['picking_type_id'] = vals['cr_operation_type_id']
-
-        if not vals.get('picking_type_id'):
-            vals['picking_type_id'] = self.env.ref('stock.picking_type_in').id
-
-        return super().create(vals)
-
     # ---------------------------------------------------------
     # WRITE Override
     # ---------------------------------------------------------
     def write(self, vals):
+        # is_cr_view only depends on the context: nothing to check outside CR
+        if not self._context.get("is_component_receipt"):
+            return super().write(vals)
+
         for rec in self:
 
             # REQUIRED ONLY IN COMPONENT RECEIPT
@@ -0,0 +1,115 @@
+import logging
+import random
+
+from odoo import models, api, Command
+from odoo.tools import split_every
+
+_logger = logging.getLogger(__name__)
+
+
+class StockPickingType(models.Model):
+    _inherit = "stock.picking.type"
+
+    @api.model
+    def _populate_cr_setup(self):
+        """Add the Component Receiving setup: one operation type per service
+        category and a CR-enabled receipt type (both are unique, so they are
+        created here and never duplicated)."""
+        warehouse = self.env["stock.warehouse"].search([("company_id", "=", self.env.company.id)], limit=1)
+        service_map = self._get_service_picking_type_map()
+        selection = self._fields["select_service"].selection
+
+        service_types = self.create([{
+            "name": f"{label} (CR)",
+            "code": "repair_operation",
+            "sequence_code": f"CR{value.upper()}",
+            "warehouse_id": warehouse.id,
+            "select_service": value,
+            "default_location_src_id": warehouse.lot_stock_id.id,
+            "default_location_dest_id": warehouse.lot_stock_id.id,
+        } for value, label in selection if value not in service_map])
+        _logger.info("Created %s Component Receiving service operation types", len(service_types))
+
+        cr_type = self.search([("is_component_receiving_enabled", "=", True)], limit=1)
+        if not cr_type:
+            cr_type = warehouse.in_type_id
+            cr_type.is_component_receiving_enabled = True
+        return cr_type
+
+
+class StockPicking(models.Model):
+    _inherit = "stock.picking"
+
+    @api.model
+    def _populate_cr_seed(self, receipt_count=50):
+        """Seed Component Receipts in every CR state for ``odoo-bin populate``.
+
+        Odoo 18 populates by duplicating existing records (``--factors``):
+        run this once, then populate ``stock.picking``, ``stock.move`` and
+        ``repair.order``. Spare kits are seeded first. Receipt sizes are
+        skewed (mostly small, a few hundred-move ones) and moves are created
+        done, without quants. Receipts marked "RO Created" get their Repair
+        Orders and "Waiting Create RO" ones their sales activities, through
+        the regular flows.
+        """
+        rng = random.Random("component_receipts")
+
+        self.env["product.template"]._populate_spare_kit_seed()
+        cr_type = self.env["stock.picking.type"]._populate_cr_setup()
+        products = self.env["product.product"].search([("service_types", "!=", False)])
+        partner_ids = self.env["res.partner"].search([], limit=1000).ids
+        if not products or not partner_ids:
+            _logger.warning("No repairable products or partners: no Component Receipts generated")
+            return self.browse()
+
+        location_id = self.env.ref("stock.stock_location_suppliers").id
+        location_dest_id = cr_type.default_location_dest_id.id or cr_type.warehouse_id.lot_stock_id.id
+
+        def move_count():
+            return rng.choices([1, 5, 20, 100, 300], [0.4, 0.3, 0.2, 0.08, 0.02])[0]
+
+        receipts = self.browse()
+        Picking = self.with_context(is_component_receipt=True)
+        for index, batch in enumerate(split_every(100, range(receipt_count)), start=1):
+            vals_list = []
+            for i in batch:
+                partner_id = rng.choice(partner_ids)
+                vals_list.append({
+                    "picking_type_id": cr_type.id,
+                    "cr_operation_type_id": cr_type.id,
+                    "partner_id": partner_id,
+                    "owner_id": partner_id,
+                    "origin": f"CR/POP/{i:06d}",
+                    "location_id": location_id,
+                    "location_dest_id": location_dest_id,
+                    "move_ids": [Command.create({
+                        "name": product.name,
+                        "product_id": product.id,
+                        "product_uom": product.uom_id.id,
+                        "product_uom_qty": 1.0,
+                        "location_id": location_id,
+                        "location_dest_id": location_dest_id,
+                        "state": "done",
+                    }) for product in rng.choices(products, k=move_count())],
+                })
+            receipts |= Picking.create(vals_list)
+            _logger.info("Component Receipts: batch %s, %s receipts", index, len(receipts))
+
+        states = {}
+        for receipt in receipts:
+            state = rng.choices(["draft", "waiting_ro", "ro_created", "cancel"], [0.4, 0.3, 0.2, 0.1])[0]
+            states[state] = states.get(state, self.browse()) | receipt
+
+        flow = self.with_context(cr_inline_side_effects=True)
+        for state, pickings in states.items():
+            pickings = pickings.with_env(flow.env)
+            pickings.write({"cr_state": state})
+            if state == "ro_created":
+                _logger.info("Generating Repair Orders for %s Component Receipts", len(pickings))
+                for batch in split_every(50, pickings.ids, pickings.browse):
+                    batch._create_repair_orders()
+            elif state == "waiting_ro":
+                _logger.info("Assigning sales activities for %s Component Receipts", len(pickings))
+                pickings._assign_sales_activities()
+
+        return receipts
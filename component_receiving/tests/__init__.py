@@ -0,0 +1 @@
+from . import test_ro_generation_performance
@@ -0,0 +1,435 @@
+from unittest.mock import patch
+
+from psycopg2 import errors
+
+from odoo import Command
+from odoo.exceptions import UserError, ValidationError
+from odoo.tests import TransactionCase, new_test_user, tagged
+
+from odoo.addons.repair_approval.tests.common import (
+    MAX_QUERIES_PER_MOVE,
+    MAX_QUERIES_PER_SPARE_LINE,
+    QueryScalingMixin,
+)
+
+# Receipt sizes (moves) and kit sizes (spare lines per product)
+MOVE_COUNTS = (1, 50, 500)
+KIT_SIZES = (0, 5, 25)
+
+
+@tagged("post_install", "-at_install")
+class TestROGenerationPerformance(QueryScalingMixin, TransactionCase):
+    """Query-count scaling of the Repair Order generation flows.
+
+    Side effects run inline (``cr_inline_side_effects``) so chatter and bus
+    work is counted too; the after-commit dispatch and the background jobs
+    have their own tests.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.env = cls.env(context=dict(
+            cls.env.context,
+            cr_inline_side_effects=True,
+            tracking_disable=True,
+        ))
+        ICP = cls.env["ir.config_parameter"].sudo()
+        ICP.set_param("component_receiving.ro_async_min_moves", 0)
+        ICP.set_param("component_receiving.sales_activity_digest", False)
+
+        cls.warehouse = cls.env["stock.warehouse"].search([("company_id", "=", cls.env.company.id)], limit=1)
+        cls.stock_location = cls.warehouse.lot_stock_id
+        cls.supplier_location = cls.env.ref("stock.stock_location_suppliers")
+        cls.partner = cls.env["res.partner"].create({"name": "CR Benchmark Customer"})
+
+        # CR-enabled receipt type (only one allowed) + battery service type
+        PickingType = cls.env["stock.picking.type"]
+        cls.receipt_type = PickingType.search([("is_component_receiving_enabled", "=", True)], limit=1)
+        if not cls.receipt_type:
+            cls.receipt_type = cls.warehouse.in_type_id
+            cls.receipt_type.is_component_receiving_enabled = True
+
+        if "battery" not in PickingType._get_service_picking_type_map():
+            PickingType.create({
+                "name": "Battery Shop (benchmark)",
+                "code": "repair_operation",
+                "sequence_code": "CRBENCH",
+                "warehouse_id": cls.warehouse.id,
+                "select_service": "battery",
+                "default_location_src_id": cls.stock_location.id,
+                "default_location_dest_id": cls.stock_location.id,
+            })
+
+        # One repairable product per kit size
+        cls.spares = spares = cls.env["product.product"].create([{
+            "name": f"Benchmark Spare {i}",
+            "type": "consu",
+            "is_spareparts": True,
+        } for i in range(max(KIT_SIZES))])
+
+        cls.repairables = {}
+        for kit_size in KIT_SIZES:
+            cls.repairables[kit_size] = cls.env["product.product"].create({
+                "name": f"Benchmark Unit (kit {kit_size})",
+                "type": "consu",
+                "service_types": "battery",
+                "spareparts_line_ids": [
+                    Command.create({"spare_product_id": spare.id}) for spare in spares[:kit_size]
+                ],
+            })
+
+        cls.sales_user = new_test_user(
+            cls.env, login="cr_bench_sales",
+            groups="base.group_user,stock.group_stock_user,sales_team.group_sale_salesman",
+        )
+
+    # =====================================================
+    # Helpers
+    # =====================================================
+    def _create_receipt(self, move_count, kit_size=5, cr_state="draft", component_receipt=True):
+        """A done receipt with ``move_count`` moves (no move lines nor quants involved).
+
+        Component Receipts are created like the Component Receiving screen
+        does (CR context + CR operation type), so the CR defaults and
+        constraints run.
+        """
+        product = self.repairables[kit_size]
+        Picking = self.env["stock.picking"]
+        cr_vals = {}
+        if component_receipt:
+            Picking = Picking.with_context(is_component_receipt=True)
+            cr_vals = {"cr_operation_type_id": self.receipt_type.id}
+
+        picking = Picking.create({
+            **cr_vals,
+            "picking_type_id": self.receipt_type.id,
+            "partner_id": self.partner.id,
+            "location_id": self.supplier_location.id,
+            "location_dest_id": self.stock_location.id,
+            "origin": "CR-BENCH",
+            "move_ids": [Command.create({
+                "name": product.name,
+                "product_id": product.id,
+                "product_uom": product.uom_id.id,
+                "product_uom_qty": 1.0,
+                "location_id": self.supplier_location.id,
+                "location_dest_id": self.stock_location.id,
+                "state": "done",
+            }) for _i in range(move_count)],
+        })
+        if cr_state != "draft":
+            picking.cr_state = cr_state
+        return picking.with_env(self.env)
+
+    def _plain_repair_orders(self, move_count, kit_size):
+        """The batched creates ``_create_repair_orders`` cannot avoid, on a fresh receipt."""
+        picking = self._create_receipt(move_count, kit_size)
+        type_id, _sequence_id = self.env["stock.picking.type"]._get_service_picking_type_map()["battery"]
+        label = dict(self.env["stock.move"]._fields["service_category"]._description_selection(self.env))["battery"]
+        tag = self.env["repair.tags"]._get_or_create_by_names([label])[label]
+        spares = self.spares[:kit_size]
+
+        def work():
+            repairs = self.env["repair.order"].create([{
+                "product_id": move.product_id.id,
+                "partner_id": picking.partner_id.id,
+                "location_id": picking.location_id.id,
+                "location_dest_id": picking.location_dest_id.id,
+                "picking_id": picking.id,
+                "picking_type_id": type_id,
+                "product_qty": move.quantity,
+                "tag_ids": [Command.link(tag.id)],
+            } for move in picking.move_ids])
+            self.env["stock.move"].with_context(from_backend=True).create([{
+                "repair_id": repair.id,
+                "repair_line_type": "add",
+                "product_id": spare.id,
+                "product_uom_qty": 1.0,
+                "quantity": 0.0,
+                "product_uom": spare.uom_id.id,
+                "location_id": picking.location_id.id,
+                "location_dest_id": picking.location_dest_id.id,
+                "company_id": picking.company_id.id,
+                "partner_id": picking.partner_id.id,
+            } for repair in repairs for spare in spares])
+
+        return work
+
+    # =====================================================
+    # _create_repair_orders
+    # =====================================================
+    def test_create_repair_orders_grows_like_plain_creates(self):
+        """On top of the batched creates, one more move costs no query."""
+        for kit_size in KIT_SIZES:
+            with self.subTest(kit_size=kit_size):
+                self._assert_scaling_like(
+                    f"_create_repair_orders vs plain creates (kit size {kit_size})",
+                    lambda size, kit_size=kit_size: self._create_receipt(size, kit_size)._create_repair_orders,
+                    lambda size, kit_size=kit_size: self._plain_repair_orders(size, kit_size),
+                    (1, 50),
+                )
+
+    def test_create_repair_orders_scaling(self):
+        for kit_size in KIT_SIZES:
+            with self.subTest(kit_size=kit_size):
+                pickings = {}
+
+                def run(size, kit_size=kit_size):
+                    picking = pickings[size] = self._create_receipt(size, kit_size)
+                    return picking._create_repair_orders
+
+                self._assert_scaling(
+                    f"_create_repair_orders (kit size {kit_size})",
+                    run, MOVE_COUNTS,
+                    MAX_QUERIES_PER_MOVE + MAX_QUERIES_PER_SPARE_LINE * kit_size,
+                )
+
+                for size, picking in pickings.items():
+                    repairs = self.env["repair.order"].search([("picking_id", "=", picking.id)])
+                    self.assertEqual(len(repairs), size)
+                    self.assertEqual(len(repairs.move_ids), size * kit_size)
+
+    # =====================================================
+    # Wizards
+    # =====================================================
+    def test_decision_wizard_yes_scaling(self):
+        Wizard = self.env["cr.repair.decision.wizard"]
+
+        def run(size):
+            picking = self._create_receipt(size)
+            wizard = Wizard.with_context(active_ids=picking.ids, active_model="stock.picking").create({
+                "option": "yes",
+            })
+            return wizard.action_confirm
+
+        self._assert_scaling(
+            "Decision wizard YES (kit size 5)",
+            run, MOVE_COUNTS,
+            MAX_QUERIES_PER_MOVE + MAX_QUERIES_PER_SPARE_LINE * 5,
+        )
+
+    def test_create_ro_wizard_scaling(self):
+        Wizard = self.env["cr.create.ro.wizard"].with_user(self.sales_user)
+
+        def run(size):
+            picking = self._create_receipt(size, cr_state="waiting_ro")
+            wizard = Wizard.with_context(active_ids=picking.ids, active_model="stock.picking").create({
+                "option": "create",
+            })
+            return wizard.action_confirm
+
+        self._assert_scaling(
+            "Create RO wizard (kit size 5)",
+            run, MOVE_COUNTS,
+            MAX_QUERIES_PER_MOVE + MAX_QUERIES_PER_SPARE_LINE * 5,
+        )
+
+    def test_wizards_reject_non_cr_pickings(self):
+        """Ordinary done transfers never get Repair Orders from the CR wizards."""
+        receipt = self._create_receipt(1)
+        self.assertTrue(receipt.is_cr_document and receipt.is_component_receiving)
+
+        transfer = self._create_receipt(3, component_receipt=False)
+        self.assertFalse(transfer.is_cr_document)
+
+        decision = self.env["cr.repair.decision.wizard"].with_context(
+            active_ids=transfer.ids, active_model="stock.picking",
+        ).create({"option": "yes"})
+        with self.assertRaises(ValidationError):
+            decision.action_confirm()
+
+        transfer.cr_state = "waiting_ro"
+        create_ro = self.env["cr.create.ro.wizard"].with_user(self.sales_user).with_context(
+            active_ids=transfer.ids, active_model="stock.picking",
+        ).create({"option": "create"})
+        with self.assertRaises(ValidationError):
+            create_ro.action_confirm()
+
+        self.assertFalse(self.env["repair.order"].search([("picking_id", "=", transfer.id)]))
+
+    # =====================================================
+    # _assign_sales_activities
+    # =====================================================
+    def test_assign_sales_activities_scaling(self):
+        """The flow only adds a constant overhead to the activities it creates."""
+        model_id = self.env["ir.model"]._get_id("stock.picking")
+        activity_type_id = self.env.ref("mail.mail_activity_data_todo").id
+
+        def receipts(count):
+            return self.env["stock.picking"].concat(*(
+                self._create_receipt(1, cr_state="waiting_ro") for _i in range(count)
+            ))
+
+        def run(users):
+            reference_vals_list = [{
+                "res_id": picking.id,
+                "res_model_id": model_id,
+                "activity_type_id": activity_type_id,
+                "summary": "Waiting Create RO",
+                "user_id": user.id,
+                "note": picking.name,
+            } for picking in receipts(10) for user in users]
+            pickings = receipts(10)
+            return reference_vals_list, pickings._assign_sales_activities, [
+                ("res_model", "=", "stock.picking"),
+                ("res_id", "in", pickings.ids),
+                ("summary", "=", "Waiting Create RO"),
+            ]
+
+        self._assert_fan_out_scaling("_assign_sales_activities, 10 pickings", run)
+
+    def test_sales_activity_digest_is_flat(self):
+        """In digest mode the cost does not depend on the number of waiting pickings."""
+        self.env["ir.config_parameter"].sudo().set_param("component_receiving.sales_activity_digest", True)
+
+        def run(size):
+            pickings = self.env["stock.picking"].concat(*(
+                self._create_receipt(1, cr_state="waiting_ro") for _i in range(size)
+            ))
+            return pickings._assign_sales_activities
+
+        self._assert_scaling("_assign_sales_activities (digest mode)", run, (1, 10, 50), 0.2)
+
+        users = self.env["res.users"]._get_sales_recipients()
+        digests = self.env["mail.activity"].search([
+            ("res_model", "=", "stock.picking"),
+            ("summary", "=", "Waiting Create RO (Digest)"),
+        ])
+        self.assertEqual(digests.user_id, users)
+
+    # =====================================================
+    # After-commit side effects
+    # =====================================================
+    def test_side_effects_wait_for_commit(self):
+        """Outside ``cr_inline_side_effects``, chatter and bus work runs after commit."""
+        self.registry.enter_test_mode(self.env.cr)
+        self.addCleanup(self.registry.leave_test_mode)
+        env = self.env(context=dict(self.env.context, cr_inline_side_effects=False))
+
+        picking = self._create_receipt(3).with_env(env)
+        messages = picking.message_ids
+        env["cr.repair.decision.wizard"].with_context(
+            active_ids=picking.ids, active_model="stock.picking",
+        ).create({"option": "yes"}).action_confirm()
+
+        self.assertEqual(picking.cr_state, "ro_created")
+        self.assertEqual(len(self.env["repair.order"].search([("picking_id", "=", picking.id)])), 3)
+        effects = self.env.cr.postcommit.data[picking._CR_SIDE_EFFECTS]
+        self.assertEqual(
+            [method for _model, _ids, _uid, _context, method, _args, _kwargs in effects],
+            ["message_post", "_notify_ro_created", "_close_waiting_ro_activities"],
+        )
+        self.assertEqual(picking.message_ids, messages)
+
+        # a failing effect is logged and does not stop the others
+        picking._cr_after_commit("_cr_missing_side_effect")
+        picking._cr_after_commit("message_post", body="Dispatched after the failure")
+
+        self.env.flush_all()
+        with self.assertLogs("odoo.addons.component_receiving.models.RO_logic", level="ERROR"):
+            self.env.cr.postcommit.run()
+
+        self.env.invalidate_all()
+        new_messages = picking.message_ids - messages
+        self.assertEqual(len(new_messages), 2)
+        self.assertIn("Dispatched after the failure", "".join(new_messages.mapped("body")))
+
+    # =====================================================
+    # Background generation jobs
+    # =====================================================
+    def _enqueue_large_receipt(self, move_count=25, chunk_size=10):
+        ICP = self.env["ir.config_parameter"].sudo()
+        ICP.set_param("component_receiving.ro_async_min_moves", 20)
+        ICP.set_param("component_receiving.ro_generation_chunk_size", chunk_size)
+
+        picking = self._create_receipt(move_count)
+        self.env["cr.repair.decision.wizard"].with_context(
+            active_ids=picking.ids, active_model="stock.picking",
+        ).create({"option": "yes"}).action_confirm()
+        job = self.env["cr.ro.generation.job"].search([("picking_id", "=", picking.id)])
+        return picking, job
+
+    def _repairs(self, picking):
+        return self.env["repair.order"].search([("picking_id", "=", picking.id)])
+
+    def test_background_generation_in_chunks(self):
+        picking, job = self._enqueue_large_receipt()
+        self.assertEqual(picking.cr_state, "generating")
+        self.assertRecordValues(job, [{"state": "pending", "total_count": 25, "processed_count": 0}])
+        self.assertFalse(self._repairs(picking))
+
+        Job = self.env["cr.ro.generation.job"]
+        Job._cron_process_jobs(max_chunks=2)
+        self.assertRecordValues(job, [{
+            "state": "pending",
+            "processed_count": 20,
+            "last_move_id": picking.move_ids.sorted("id")[19].id,
+        }])
+        self.assertEqual(picking.cr_state, "generating")
+        self.assertEqual(len(self._repairs(picking)), 20)
+
+        Job._cron_process_jobs()
+        self.assertRecordValues(job, [{"state": "done", "processed_count": 25}])
+        self.assertEqual(picking.cr_state, "ro_created")
+        self.assertEqual(len(self._repairs(picking)), 25)
+        self.assertEqual(len(self._repairs(picking).move_ids), 25 * 5)
+
+    def test_background_generation_failure_and_retry(self):
+        picking, job = self._enqueue_large_receipt()
+        Job = self.env["cr.ro.generation.job"]
+        Picking = type(self.env["stock.picking"])
+
+        with patch.object(Picking, "_generate_repair_orders", side_effect=UserError("Kit misconfigured")), \
+                self.assertLogs("odoo.addons.component_receiving.models.ro_generation_job", level="ERROR"):
+            Job._cron_process_jobs()
+
+        self.assertEqual(job.state, "failed")
+        self.assertIn("Kit misconfigured", job.error)
+        self.assertEqual(job.processed_count, 0)
+        self.assertEqual(picking.cr_state, "generating")
+        self.assertFalse(self._repairs(picking))
+
+        job.action_retry()
+        self.assertEqual(job.state, "pending")
+        Job._cron_process_jobs()
+        self.assertEqual(job.state, "done")
+        self.assertEqual(picking.cr_state, "ro_created")
+        self.assertEqual(len(self._repairs(picking)), 25)
+
+    def test_background_generation_postponed_on_conflict(self):
+        """A concurrency error leaves the job pending for the next run."""
+        picking, job = self._enqueue_large_receipt()
+        Job = self.env["cr.ro.generation.job"]
+        Picking = type(self.env["stock.picking"])
+
+        with patch.object(Picking, "_generate_repair_orders", side_effect=errors.SerializationFailure()):
+            Job._cron_process_jobs()
+
+        self.assertRecordValues(job, [{"state": "pending", "processed_count": 0, "error": False}])
+        self.assertFalse(self._repairs(picking))
+
+        Job._cron_process_jobs()
+        self.assertEqual(job.state, "done")
+        self.assertEqual(len(self._repairs(picking)), 25)
+
+    # =====================================================
+    # Indexes used by the CR queues and filters
+    # =====================================================
+    def test_cr_filters_use_indexes(self):
+        for query in (
+            "SELECT id FROM stock_picking WHERE cr_state = 'waiting_ro'",
+            "SELECT id FROM stock_picking WHERE is_cr_receipt",
+            "SELECT id FROM stock_picking WHERE is_component_receiving",
+            "SELECT id FROM stock_picking WHERE is_cr_document",
+            "SELECT id FROM stock_move WHERE service_category = 'battery'",
+            "SELECT id FROM cr_ro_generation_job WHERE state = 'pending'",
+            f"SELECT id FROM product_spareparts_line WHERE product_tmpl_id = {self.repairables[5].product_tmpl_id.id}",
+        ):
+            with self.subTest(query=query):
+                self._assert_uses_index(query)
+
+        self._assert_uses_index(
+            "SELECT id FROM stock_picking WHERE cr_state = 'waiting_ro' ORDER BY id",
+            "stock_picking_cr_waiting_ro_index",
+        )
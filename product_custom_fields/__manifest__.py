@@ -1,10 +1,10 @@
 {
     'name': 'Product Custom Fields',
-    'version': '1.0',
+    'version': '1.1',
     'author': 'Mohamed Said',
     'category': 'Product',
     'license': 'LGPL-3',
-    'depends': ['product', 'account'],
+    'depends': ['product', 'account', 'stock'],
     'data': [
         'security/ir.model.access.csv',
         'views/product_form_view.xml',
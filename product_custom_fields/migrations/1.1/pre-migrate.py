@@ -0,0 +1,20 @@
+def migrate(cr, version):
+    """Compile the stored product.template spare_kit in SQL."""
+    if not version:
+        return
+
+    cr.execute("""
+        ALTER TABLE product_template
+            ADD COLUMN IF NOT EXISTS spare_kit jsonb
+    """)
+
+    cr.execute("""
+        UPDATE product_template tmpl
+           SET spare_kit = COALESCE((
+                SELECT jsonb_agg(jsonb_build_array(line.spare_product_id, spare_tmpl.uom_id) ORDER BY line.id)
+                  FROM product_spareparts_line line
+                  JOIN product_product spare ON spare.id = line.spare_product_id
+                  JOIN product_template spare_tmpl ON spare_tmpl.id = spare.product_tmpl_id
+                 WHERE line.product_tmpl_id = tmpl.id
+           ), '[]'::jsonb)
+    """)
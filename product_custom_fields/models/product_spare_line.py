@@ -1,11 +1,11 @@
-from odoo import models, fields
+from odoo import models, fields, api
 
 
 class ProductSparePartsLine(models.Model):
     _name = "product.spareparts.line"
     _description = "Spare Parts Lines"
 
-    product_tmpl_id = fields.Many2one("product.template")
+    product_tmpl_id = fields.Many2one("product.template", index=True)
 
     spare_product_id = fields.Many2one(
         "product.product",
@@ -26,8 +26,25 @@ class ProductSparePartsLine(models.Model):
         readonly=True
     )
 
+    # computed for the whole tab with one grouped quant query
     quantity_on_hand = fields.Float(
-        related="spare_product_id.qty_available",
+        compute="_compute_quantities",
         string="Quantity On Hand",
-        readonly=True
+        digits="Product Unit of Measure"
+    )
+
+    quantity_free = fields.Float(
+        compute="_compute_quantities",
+        string="Free Quantity",
+        digits="Product Unit of Measure"
     )
+
+    @api.depends("spare_product_id")
+    def _compute_quantities(self):
+        availability = self.env["product.template"]._get_spare_availability(
+            set(self.spare_product_id.ids)
+        )
+        for line in self:
+            per_location = availability.get(line.spare_product_id.id, {}).values()
+            line.quantity_on_hand = sum(on_hand for on_hand, _reserved, _free in per_location)
+            line.quantity_free = sum(free for _on_hand, _reserved, free in per_location)
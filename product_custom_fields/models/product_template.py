@@ -21,57 +21,160 @@ class ProductTemplate(models.Model):
     @api.model_create_multi
     def create(self, vals_list):
         products = super().create(vals_list)
-        for product, vals in zip(products, vals_list):
-            if vals.get('is_spareparts'):
-                product._notify_spare_parts_added()
+        products.filtered('is_spareparts')._notify_spare_parts_added()
         return products
 
     def write(self, vals):
-        # نعرف الحالة القديمة قبل الكتابة
-        old_values = {p.id: p.is_spareparts for p in self}
+        # نعرف الحالة القديمة قبل الكتابة (only when the flag is written)
+        changed = self.browse()
+        if 'is_spareparts' in vals:
+            changed = self.filtered(lambda p: p.is_spareparts != bool(vals['is_spareparts']))
 
         res = super().write(vals)
 
         # بعد الكتابة
-        if 'is_spareparts' in vals:
-            for product in self:
-                old = old_values[product.id]
-                new = product.is_spareparts
+        if changed:
+            if vals['is_spareparts']:
+                # اتفعّل ✔
+                changed._notify_spare_parts_added()
+            else:
+                # اتلغى ❌
+                changed._notify_spare_parts_removed()
 
-                if not old and new:
-                    # اتفعّل ✔
-                    product._notify_spare_parts_added()
+        return res
 
-                elif old and not new:
-                    # اتلغى ❌
-                    product._notify_spare_parts_removed()
+    # ==========================================================
+    # Spare kit expansion (shared by RO generation and others)
+    # ==========================================================
+    # compiled kit: [[spare_product_id, uom_id], ...], recomputed by the
+    # ORM for the templates whose spare lines (or spare units) change
+    spare_kit = fields.Json(compute='_compute_spare_kit', store=True, copy=False)
 
-        return res
+    @api.depends('spareparts_line_ids.spare_product_id.uom_id')
+    def _compute_spare_kit(self):
+        for tmpl in self:
+            tmpl.spare_kit = [
+                [line.spare_product_id.id, line.spare_product_id.uom_id.id]
+                for line in tmpl.spareparts_line_ids.sorted('id')
+                if line.spare_product_id
+            ]
+
+    def _get_spare_kits(self):
+        """Return ``{template_id: ((spare_product_id, uom_id), ...)}`` for ``self``.
+
+        Kits are compiled per template in ``spare_kit``, so expanding a
+        whole receipt reads one column for all its templates.
+        """
+        return {
+            tmpl.id: tuple(tuple(spare) for spare in tmpl.spare_kit or ())
+            for tmpl in self
+        }
+
+    # ==========================================================
+    # Spare kit availability (one grouped quant query)
+    # ==========================================================
+    def _get_spare_kit_availability(self, location_ids=None):
+        """Availability of every spare of the kits of ``self``.
+
+        See ``_get_spare_availability`` for the returned structure.
+        """
+        product_ids = {
+            spare_product_id
+            for kit in self._get_spare_kits().values()
+            for spare_product_id, _uom_id in kit
+        }
+        return self._get_spare_availability(product_ids, location_ids)
+
+    @api.model
+    def _get_spare_availability(self, product_ids, location_ids=None):
+        """Return ``{product_id: {location_id: (on_hand, reserved, free)}}``.
+
+        Quants of internal locations of the current companies are summed
+        with a single grouped query. Results are memoized for the rest of
+        the transaction, so repeated renders do not aggregate quants again.
+        """
+        key = (tuple(sorted(location_ids or ())), tuple(self.env.companies.ids))
+        memo = self.env.cr.precommit.data.setdefault(
+            'product_custom_fields.spare_availability', {}
+        ).setdefault(key, {})
+
+        missing = [product_id for product_id in product_ids if product_id not in memo]
+        if missing:
+            domain = [
+                ('product_id', 'in', missing),
+                ('location_id.usage', '=', 'internal'),
+                ('company_id', 'in', self.env.companies.ids),
+            ]
+            if location_ids:
+                domain.append(('location_id', 'child_of', list(location_ids)))
+
+            memo.update({product_id: {} for product_id in missing})
+            groups = self.env['stock.quant'].sudo()._read_group(
+                domain,
+                ['product_id', 'location_id'],
+                ['quantity:sum', 'reserved_quantity:sum'],
+            )
+            for product, location, on_hand, reserved in groups:
+                memo[product.id][location.id] = (on_hand, reserved, on_hand - reserved)
+
+        return {product_id: memo[product_id] for product_id in product_ids}
+
+    # ==========================================================
+    # Notifications (buffered per transaction, one summary each)
+    # ==========================================================
+    _SPARE_NOTIFICATIONS = 'product_custom_fields.spare_notifications'
 
     # Notification when enabled
     def _notify_spare_parts_added(self):
-        message = f"Product '{self.name}' is now Spare Parts"
-        self.env['bus.bus']._sendone(
-            self.env.user.partner_id,
-            'simple_notification',
-            {
-
-                'message': message,
-                'type': 'success',  # أخضر
-                'sticky': False
-            }
-        )
+        self._buffer_spare_parts_notification('added')
 
     # Notification when disabled
     def _notify_spare_parts_removed(self):
-        message = f"Product '{self.name}' is no longer Spare Parts"
-        self.env['bus.bus']._sendone(
-            self.env.user.partner_id,
-            'simple_notification',
-            {
-
-                'message': message,
-                'type': 'warning',  # أصفر
-                'sticky': False
-            }
+        self._buffer_spare_parts_notification('removed')
+
+    def _buffer_spare_parts_notification(self, kind):
+        if not self:
+            return
+        data = self.env.cr.precommit.data
+        if self._SPARE_NOTIFICATIONS not in data:
+            data[self._SPARE_NOTIFICATIONS] = {}
+            self.env.cr.precommit.add(self._flush_spare_parts_notifications)
+
+        buffer = data[self._SPARE_NOTIFICATIONS].setdefault(
+            (self.env.user.partner_id.id, kind), {'count': 0, 'name': False}
         )
+        buffer['count'] += len(self)
+        buffer['name'] = buffer['name'] or self[0].name
+
+    def _flush_spare_parts_notifications(self):
+        """Send one summary per user and kind.
+
+        Runs as the last step before commit, so the bus rows are committed
+        (and delivered) with the products, and nothing is sent for a
+        transaction that is rolled back.
+        """
+        buffers = self.env.cr.precommit.data.pop(self._SPARE_NOTIFICATIONS, {})
+        for (partner_id, kind), buffer in buffers.items():
+            count, name = buffer['count'], buffer['name']
+            if kind == 'added':
+                message = (
+                    f"Product '{name}' is now Spare Parts" if count == 1
+                    else f"{count:,} products are now Spare Parts"
+                )
+                notification_type = 'success'  # أخضر
+            else:
+                message = (
+                    f"Product '{name}' is no longer Spare Parts" if count == 1
+                    else f"{count:,} products are no longer Spare Parts"
+                )
+                notification_type = 'warning'  # أصفر
+
+            self.env['bus.bus']._sendone(
+                self.env['res.partner'].browse(partner_id),
+                'simple_notification',
+                {
+                    'message': message,
+                    'type': notification_type,
+                    'sticky': False
+                }
+            )
@@ -0,0 +1,49 @@
+import logging
+import random
+
+from odoo import models, api
+
+_logger = logging.getLogger(__name__)
+
+SERVICE_TYPES = ["battery", "wheels", "ndt", "spare"]
+
+
+class ProductTemplate(models.Model):
+    _inherit = "product.template"
+
+    @api.model
+    def _populate_spare_kit_seed(self, max_kit_size=5):
+        """Turn the existing goods into spare parts, repairable products and kits.
+
+        ``odoo-bin populate --factors`` (Odoo 18) multiplies existing
+        records, so this builds the shape it duplicates: ~30% spare parts,
+        ~40% of the others repairable (one service category each) with a kit
+        of up to ``max_kit_size`` spare parts.
+        """
+        rng = random.Random("spare_kits")
+        goods = self.search([("type", "=", "consu"), ("spareparts_line_ids", "=", False)], order="id")
+
+        new_spares = goods.filtered(lambda t: not t.service_types and rng.random() < 0.3)
+        new_spares.write({"is_spareparts": True})
+
+        candidates = goods.filtered(lambda t: not t.is_spareparts and not t.service_types)
+        by_service = {}
+        for template in candidates.filtered(lambda t: rng.random() < 0.4):
+            service = rng.choice(SERVICE_TYPES)
+            by_service[service] = by_service.get(service, self.browse()) | template
+        for service, templates in by_service.items():
+            templates.write({"service_types": service})
+
+        repairables = goods.filtered("service_types")
+        spare_ids = self.env["product.product"].search([("is_spareparts", "=", True)]).ids
+        if not repairables or not spare_ids:
+            _logger.warning("No repairable or spare part products: no spare kits generated")
+            return self.env["product.spareparts.line"]
+
+        lines = self.env["product.spareparts.line"].create([{
+            "product_tmpl_id": template.id,
+            "spare_product_id": spare_id,
+        } for template in repairables
+          for spare_id in rng.sample(spare_ids, min(rng.randint(0, max_kit_size), len(spare_ids)))])
+        _logger.info("Created %s spare kit lines for %s repairable products", len(lines), len(repairables))
+        return lines
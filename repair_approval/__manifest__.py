@@ -7,6 +7,8 @@
         'views/repair_approval_views.xml',
         'views/repair_cancel_wizard_view.xml',
         'views/modify_cancel_button_repair.xml',
+        'views/perf_metrics_views.xml',
+        'data/ir_cron_data.xml',
     ],
     'installable': True,
     'application': True
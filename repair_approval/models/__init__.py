@@ -1,3 +1,6 @@
 from . import repair_order
 from . import wizards
-from . import repair_cancel_wizard
\ No newline at end of file
+from . import repair_cancel_wizard
+from . import res_users
+from . import mail_activity
+from . import perf_metrics
@@ -0,0 +1,14 @@
+import threading
+
+
+def committed_chunks(cr, max_chunks):
+    """Yield ``max_chunks`` chunk indexes, committing ``cr`` after each chunk.
+
+    Long crons use it so a killed worker keeps the chunks already done.
+    Nothing is committed in tests, where the test cursor must stay open.
+    """
+    auto_commit = not getattr(threading.current_thread(), "testing", False)
+    for index in range(max_chunks):
+        yield index
+        if auto_commit:
+            cr.commit()
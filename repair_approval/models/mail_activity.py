@@ -0,0 +1,84 @@
+import logging
+
+from odoo import models, fields, api
+
+from .batching import committed_chunks
+
+_logger = logging.getLogger(__name__)
+
+
+class MailActivity(models.Model):
+    _inherit = "mail.activity"
+
+    # key of the "Approval Request Sent" upsert (see action_send_request)
+    approval_line_id = fields.Many2one(
+        "repair.approval.line",
+        string="Approval Line",
+        index="btree_not_null",
+        ondelete="cascade"
+    )
+
+    # ===========================
+    #   SYSTEM ACTIVITY CLEANUP
+    # ===========================
+    @api.model
+    def _unlink_system_activities(self, domain):
+        """Delete the system-generated activities matching ``domain``.
+
+        These are automatic requests (approval requests, "Waiting Create RO"
+        reminders), not work done by their users: they are removed with one
+        ``unlink`` instead of ``action_feedback``, so no "activity done"
+        message is posted per activity. Every flow and sweep closing such
+        requests goes through here.
+        """
+        activities = self.sudo().search(domain)
+        activities.unlink()
+        return activities
+
+    @api.model
+    def _sweep_stale_activities(self, query, params=None, chunk_size=500, max_chunks=20):
+        """Delete the activities selected by ``query`` in bounded chunks.
+
+        ``query`` must select activity ids and accept a ``%(limit)s``
+        parameter. Each chunk is committed (outside tests). Returns ``True``
+        when the budget ran out before the sweep was complete, so the
+        caller can trigger its cron again.
+        """
+        params = dict(params or {}, limit=chunk_size)
+
+        for _chunk in committed_chunks(self.env.cr, max_chunks):
+            self.env.cr.execute(query, params)
+            ids = [row[0] for row in self.env.cr.fetchall()]
+            if not ids:
+                return False
+
+            self._unlink_system_activities([("id", "in", ids)])
+            _logger.info("Swept %s stale activities", len(ids))
+
+        return True
+
+    @api.model
+    def _cron_sweep_approval_activities(self):
+        """Drop "Approval Request Sent" activities whose lines no longer wait."""
+        self.flush_model()
+        self.env["repair.approval.line"].flush_model(["approve_state", "repair_id"])
+        remaining = self._sweep_stale_activities("""
+            SELECT a.id
+              FROM mail_activity a
+         LEFT JOIN repair_approval_line line ON line.id = a.approval_line_id
+             WHERE a.res_model = 'repair.order'
+               AND a.summary = 'Approval Request Sent'
+               AND (
+                    (a.approval_line_id IS NOT NULL AND line.approve_state != 'waiting')
+                 OR (a.approval_line_id IS NULL AND NOT EXISTS (
+                        SELECT 1
+                          FROM repair_approval_line waiting
+                         WHERE waiting.repair_id = a.res_id
+                           AND waiting.approve_state = 'waiting'
+                    ))
+               )
+          ORDER BY a.id
+             LIMIT %(limit)s
+        """)
+        if remaining:
+            self.env.ref("repair_approval.ir_cron_sweep_approval_activities")._trigger()
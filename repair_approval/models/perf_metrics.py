@@ -0,0 +1,133 @@
+import functools
+import json
+import logging
+import time
+
+from odoo import models, fields, api, tools
+
+_logger = logging.getLogger(__name__)
+
+PERF_PARAM = "repair_approval.perf_instrumentation"
+
+
+# ==========================================================
+# Hot-path instrumentation
+# ==========================================================
+def instrumented(entry_point, records=len):
+    """Measure wall time, SQL queries and records touched by a method.
+
+    Disabled unless the ``repair_approval.perf_instrumentation`` system
+    parameter is set: the check is a cached parameter lookup, so the
+    overhead when off is a dict access. ``records`` computes the number of
+    records touched from ``self`` before the call (``len`` by default).
+    """
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            Sample = self.env["repair.approval.perf.sample"]
+            if not Sample._is_enabled():
+                return method(self, *args, **kwargs)
+
+            cr = self.env.cr
+            count = records(self)
+            queries = cr.sql_log_count
+            start = time.perf_counter()
+
+            result = method(self, *args, **kwargs)
+
+            Sample._record(
+                entry_point,
+                duration=time.perf_counter() - start,
+                query_count=cr.sql_log_count - queries,
+                record_count=count,
+            )
+            return result
+        return wrapper
+    return decorator
+
+
+class RepairApprovalPerfSample(models.Model):
+    _name = "repair.approval.perf.sample"
+    _description = "Hot-path Performance Sample"
+    _order = "id desc"
+    _log_access = False
+
+    entry_point = fields.Char(required=True, index=True, readonly=True)
+    create_date = fields.Datetime(default=fields.Datetime.now, index=True, readonly=True)
+    user_id = fields.Many2one("res.users", readonly=True)
+    duration_ms = fields.Float("Duration (ms)", readonly=True, aggregator="avg")
+    query_count = fields.Integer("SQL Queries", readonly=True, aggregator="avg")
+    record_count = fields.Integer("Records", readonly=True, aggregator="avg")
+
+    @api.model
+    def _is_enabled(self):
+        return tools.str2bool(
+            self.env["ir.config_parameter"].sudo().get_param(PERF_PARAM, "False"),
+            default=False,
+        )
+
+    @api.model
+    def _record(self, entry_point, duration, query_count, record_count):
+        duration_ms = round(duration * 1000.0, 3)
+        _logger.info("perf %s", json.dumps({
+            "entry_point": entry_point,
+            "duration_ms": duration_ms,
+            "queries": query_count,
+            "records": record_count,
+            "uid": self.env.uid,
+        }))
+        self.sudo().create({
+            "entry_point": entry_point,
+            "user_id": self.env.uid,
+            "duration_ms": duration_ms,
+            "query_count": query_count,
+            "record_count": record_count,
+        })
+
+    @api.autovacuum
+    def _gc_old_samples(self):
+        """Keep 30 days of samples."""
+        self.env.cr.execute(
+            "DELETE FROM repair_approval_perf_sample WHERE create_date < now() at time zone 'UTC' - interval '30 days'"
+        )
+
+
+# ==========================================================
+# Daily percentiles per entry point (SQL view)
+# ==========================================================
+class RepairApprovalPerfReport(models.Model):
+    _name = "repair.approval.perf.report"
+    _description = "Hot-path Performance Report"
+    _auto = False
+    _order = "day desc, entry_point"
+
+    entry_point = fields.Char(readonly=True)
+    day = fields.Date(readonly=True)
+    sample_count = fields.Integer("Calls", readonly=True)
+    duration_p50 = fields.Float("p50 (ms)", readonly=True, aggregator="max")
+    duration_p95 = fields.Float("p95 (ms)", readonly=True, aggregator="max")
+    duration_p99 = fields.Float("p99 (ms)", readonly=True, aggregator="max")
+    duration_max = fields.Float("Max (ms)", readonly=True, aggregator="max")
+    query_p50 = fields.Float("Queries p50", readonly=True, aggregator="max")
+    query_p95 = fields.Float("Queries p95", readonly=True, aggregator="max")
+    record_avg = fields.Float("Avg Records", readonly=True, aggregator="avg")
+
+    def init(self):
+        tools.drop_view_if_exists(self.env.cr, self._table)
+        self.env.cr.execute(f"""
+            CREATE OR REPLACE VIEW {self._table} AS (
+                SELECT row_number() OVER (ORDER BY entry_point, create_date::date) AS id,
+                       entry_point,
+                       create_date::date AS day,
+                       count(*) AS sample_count,
+                       percentile_cont(0.50) WITHIN GROUP (ORDER BY duration_ms) AS duration_p50,
+                       percentile_cont(0.95) WITHIN GROUP (ORDER BY duration_ms) AS duration_p95,
+                       percentile_cont(0.99) WITHIN GROUP (ORDER BY duration_ms) AS duration_p99,
+                       max(duration_ms) AS duration_max,
+                       percentile_cont(0.50) WITHIN GROUP (ORDER BY query_count) AS query_p50,
+                       percentile_cont(0.95) WITHIN GROUP (ORDER BY query_count) AS query_p95,
+                       avg(record_count) AS record_avg
+                  FROM repair_approval_perf_sample
+              GROUP BY entry_point, create_date::date
+            )
+        """)
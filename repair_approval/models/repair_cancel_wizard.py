@@ -1,6 +1,8 @@
 from odoo import models, fields
 from markupsafe import Markup, escape
 
+from .perf_metrics import instrumented
+
 
 class RepairOrder(models.Model):
     _inherit = "repair.order"
@@ -48,6 +50,7 @@ class RepairCancelWizard(models.TransientModel):
         required=True
     )
 
+    @instrumented("repair_approval.cancel_wizard_confirm")
     def action_confirm_cancel(self):
         self.ensure_one()
         repair = self.repair_id
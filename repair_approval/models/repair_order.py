@@ -12,23 +12,33 @@ class RepairOrder(models.Model):
         string="Approval Lines"
     )
 
+    # ===========================
+    #   BULK APPROVE / REJECT
+    # ===========================
+    def _get_pending_approval_lines(self):
+        lines = self.approval_line_ids.filtered(lambda l: l.approve_state in ("draft", "waiting"))
+        if not lines:
+            raise ValidationError("There are no pending approval lines.")
+        return lines
+
+    def action_approve_pending_lines(self):
+        return self._get_pending_approval_lines().open_approve_wizard()
+
+    def action_reject_pending_lines(self):
+        return self._get_pending_approval_lines().open_reject_wizard()
+
 
 class StockMove(models.Model):
     _inherit = "stock.move"
 
-    @api.model
+    @api.model_create_multi
     def create(self, vals_list):
         # detect if created from UI (NOT backend)
         is_ui_create = not self.env.context.get("from_backend", False)
 
-        for vals in vals_list:
-            # check if it is related to Repair
-            repair_id = vals.get("repair_id")
-            if repair_id and is_ui_create:
-                # user is not sales → forbid creation
-                if not self.env.user.has_group("sales_team.group_sale_salesman") and \
-                   not self.env.user.has_group("sales_team.group_sale_salesman_all_leads") and \
-                   not self.env.user.has_group("sales_team.group_sale_manager"):
-                    raise ValidationError("❌ Only Sales users can add Parts manually.")
+        # check if any line is related to Repair; user is not sales → forbid creation
+        if is_ui_create and any(vals.get("repair_id") for vals in vals_list):
+            if not self.env.user._can_act_as_sales():
+                raise ValidationError("❌ Only Sales users can add Parts manually.")
 
         return super().create(vals_list)
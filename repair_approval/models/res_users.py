@@ -0,0 +1,96 @@
+from odoo import models, api, tools
+
+
+SALES_GROUP_XMLIDS = (
+    "sales_team.group_sale_salesman",  # Own Documents Only
+    "sales_team.group_sale_salesman_all_leads",  # All Documents
+    "sales_team.group_sale_manager",  # Sales Administrator
+)
+
+
+class ResUsers(models.Model):
+    _inherit = "res.users"
+
+    # ===========================
+    #   SALES RECIPIENTS (cached)
+    # ===========================
+    @api.model
+    @tools.ormcache()
+    def _get_sales_recipient_ids(self):
+        """Ids of the active internal users of the Sales groups.
+
+        Implied memberships are materialized in ``res_groups_users_rel`` by
+        ``res.groups``, so managers are found through the groups they imply.
+        OdooBot / root are excluded. Cached for the registry and cleared on
+        any user or group membership change.
+        """
+        group_ids = []
+        for xmlid in SALES_GROUP_XMLIDS:
+            group = self.env.ref(xmlid, raise_if_not_found=False)
+            if group:
+                group_ids.append(group.id)
+
+        if not group_ids:
+            return ()
+
+        exclude_ids = []
+        for bot_xmlid in ("base.user_odoo_bot", "base.user_root"):
+            bot = self.env.ref(bot_xmlid, raise_if_not_found=False)
+            if bot:
+                exclude_ids.append(bot.id)
+
+        users = self.sudo().with_context(active_test=True).search([
+            ("groups_id", "in", group_ids),
+            ("share", "=", False),
+            ("id", "not in", exclude_ids),
+        ], order="id")
+        return tuple(users.ids)
+
+    @api.model
+    def _get_sales_recipients(self):
+        return self.browse(self._get_sales_recipient_ids())
+
+    # ===========================
+    #   SALES CAPABILITY (cached)
+    # ===========================
+    @api.model
+    @tools.ormcache('user_id')
+    def _get_sales_capability(self, user_id):
+        return any(self.browse(user_id).has_group(xmlid) for xmlid in SALES_GROUP_XMLIDS)
+
+    def _can_act_as_sales(self):
+        """Single "can act as sales" rule shared by every Sales guard.
+
+        Resolved once per user and cached with the sales recipients, so it is
+        invalidated by the same user / group membership changes.
+        """
+        self.ensure_one()
+        return self._get_sales_capability(self.id)
+
+    # ===========================
+    #   CACHE INVALIDATION
+    #   (membership / active changes are already cleared by core
+    #    res.users.write and res.groups.write)
+    # ===========================
+    def _has_sales_members(self):
+        """Whether these users include an internal member of a Sales group."""
+        group_ids = {
+            group.id
+            for group in (self.env.ref(xmlid, raise_if_not_found=False) for xmlid in SALES_GROUP_XMLIDS)
+            if group
+        }
+        return any(not user.share and group_ids & set(user.groups_id.ids) for user in self.sudo())
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        users = super().create(vals_list)
+        if users._has_sales_members():
+            self.env.registry.clear_cache()
+        return users
+
+    def unlink(self):
+        has_sales_members = self._has_sales_members()
+        res = super().unlink()
+        if has_sales_members:
+            self.env.registry.clear_cache()
+        return res
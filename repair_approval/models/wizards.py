@@ -1,5 +1,8 @@
 from odoo import models, fields, api
 from odoo.exceptions import ValidationError
+from odoo.tools import sql
+
+from .perf_metrics import instrumented
 
 
 class RepairApprovalLine(models.Model):
@@ -7,18 +10,6 @@ class RepairApprovalLine(models.Model):
     _description = "Repair Approval Line"
     _order = "id desc"
 
-    has_sales_access = fields.Boolean(compute="_compute_has_sales_access")
-
-    def _compute_has_sales_access(self):
-        user = self.env.user
-        allowed = (
-                user.has_group('sales_team.group_sale_salesman') or
-                user.has_group('sales_team.group_sale_salesman_all_leads') or
-                user.has_group('sales_team.group_sale_manager')
-        )
-        for rec in self:
-            rec.has_sales_access = allowed
-
     # ===========================
     #       RELATION
     # ===========================
@@ -26,6 +17,7 @@ class RepairApprovalLine(models.Model):
         "repair.order",
         string="Repair Order",
         required=True,
+        index=True,
         ondelete="cascade"
     )
 
@@ -70,35 +62,15 @@ class RepairApprovalLine(models.Model):
         ("waiting", "Waiting Approval"),
         ("approved", "Approved"),
         ("rejected", "Rejected"),
-    ], default="draft", required=True)
-
-    badge_state = fields.Html(
-        compute="_compute_badge_state",
-        sanitize=False
-    )
-
-    def _compute_badge_state(self):
-        for rec in self:
-            if rec.approve_state == "approved":
-                color = "#3CB371"  # Green
-            elif rec.approve_state == "rejected":
-                color = "#DC143C"  # Red
-            else:
-                color = "#17A2B8"  # Blue
-
-            label = dict(self._fields["approve_state"].selection).get(rec.approve_state)
-
-            rec.badge_state = f"""
-                <span style="
-                    background-color:{color};
-                    color:white;
-                    padding:4px 8px;
-                    border-radius:6px;
-                    font-size:12px;
-                    font-weight:bold;">
-                    {label}
-                </span>
-            """
+    ], default="draft", required=True, index=True)
+
+    def init(self):
+        super().init()
+        # hot queue: lines waiting for the Sales Team
+        sql.create_index(
+            self._cr, "repair_approval_line_waiting_index", self._table,
+            ["repair_id"], where="approve_state = 'waiting'",
+        )
 
     # ===========================
     #      ONCHANGE PRODUCT
@@ -109,98 +81,96 @@ class RepairApprovalLine(models.Model):
         if self.product_id:
             self.product_uom = self.product_id.uom_id.id
 
+    @instrumented("repair_approval.send_request")
     def action_send_request(self):
-        self.ensure_one()
+        """Ask every sales user to review the lines.
 
+        Activities are upserted on (model, res_id, user, activity type,
+        approval line): an open request is kept (its deadline moved to
+        today with one write) instead of duplicated, with one read for all
+        the existing ones and one batched create.
+        """
         # رجع الحالة إلى waiting إذا كانت مختلفة
-        if self.approve_state != "waiting":
-            self.approve_state = "waiting"
-
-        # 1) جروبات Sales
-        sales_groups = [
-            "sales_team.group_sale_salesman",
-            "sales_team.group_sale_salesman_all_leads",
-            "sales_team.group_sale_manager",
-        ]
-
-        sales_group_ids = []
-        for xmlid in sales_groups:
-            try:
-                sales_group_ids.append(self.env.ref(xmlid).id)
-            except:
-                pass
-
-        if not sales_group_ids:
-            return
-
-        # 2) Get Users via SQL
-        self.env.cr.execute("""
-            SELECT DISTINCT uid 
-            FROM res_groups_users_rel 
-            WHERE gid IN %s
-        """, (tuple(sales_group_ids),))
+        self.filtered(lambda l: l.approve_state != "waiting").write({"approve_state": "waiting"})
 
-        user_ids = [row[0] for row in self.env.cr.fetchall()]
-        users = self.env["res.users"].browse(user_ids)
-
-        # ============================
-        # 🚫 استبعاد OdooBot + root
-        # ============================
-        exclude_ids = []
-        for bot_xmlid in ["base.user_odoo_bot", "base.user_root"]:
-            try:
-                exclude_ids.append(self.env.ref(bot_xmlid).id)
-            except:
-                pass
-
-        users = users.filtered(lambda u: u.id not in exclude_ids)
+        # 1) Sales users (cached service)
+        users = self.env["res.users"]._get_sales_recipients()
 
         if not users:
             return
 
-        # 3) model ID
+        # 2) model ID + activity type (resolved once)
         model_id = self.env['ir.model']._get_id('repair.order')
 
         Activity = self.env["mail.activity"]
-        activity_type = self.env.ref("mail.mail_activity_data_todo")
-
-        # 4) إنشاء Activities
-        for user in users:
-            Activity.create({
-                "res_id": self.repair_id.id,
-                "res_model_id": model_id,
-                "activity_type_id": activity_type.id,
-                "user_id": user.id,
-                "summary": "Approval Request Sent",
-                "note": f"""
+        activity_type_id = self.env.ref("mail.mail_activity_data_todo").id
+
+        # 3) Existing open requests (one read)
+        existing = Activity.search([
+            ("res_model", "=", "repair.order"),
+            ("res_id", "in", self.repair_id.ids),
+            ("user_id", "in", users.ids),
+            ("activity_type_id", "=", activity_type_id),
+            ("approval_line_id", "in", self.ids),
+        ])
+        existing_keys = {
+            (activity.res_id, activity.user_id.id, activity.approval_line_id.id)
+            for activity in existing
+        }
+
+        # 4) Refresh the open requests (one write), create the missing ones
+        today = fields.Date.context_today(self)
+        overdue = existing.filtered(lambda a: a.date_deadline != today)
+        if overdue:
+            overdue.with_context(mail_activity_quick_update=True).write({"date_deadline": today})
+
+        vals_list = []
+        for line in self:
+            missing_users = users.filtered(
+                lambda user: (line.repair_id.id, user.id, line.id) not in existing_keys
+            )
+            if not missing_users:
+                continue
+
+            note = f"""
                 <b>Repair Approval Required</b><br/><br/>
 
-                <b>Repair Order:</b> {self.repair_id.name}<br/>
-                <b>Product:</b> {self.product_id.display_name}<br/>
-                <b>Requested Qty:</b> {self.quantity} {self.product_uom.name}<br/><br/>
+                <b>Repair Order:</b> {line.repair_id.name}<br/>
+                <b>Product:</b> {line.product_id.display_name}<br/>
+                <b>Requested Qty:</b> {line.quantity} {line.product_uom.name}<br/><br/>
 
                 Please review this request and take action:
                 <b>Approve</b> or <b>Reject</b>.
-                        """,
-            })
-
+                        """
+
+            for user in missing_users:
+                vals_list.append({
+                    "res_id": line.repair_id.id,
+                    "res_model_id": model_id,
+                    "activity_type_id": activity_type_id,
+                    "user_id": user.id,
+                    "approval_line_id": line.id,
+                    "summary": "Approval Request Sent",
+                    "note": note,
+                })
+
+        if vals_list:
+            Activity.create(vals_list)
 
         return True
 
-
-
     # ===========================
     #     OPEN WIZARDS
     # ===========================
     def open_approve_wizard(self):
         return {
             "type": "ir.actions.act_window",
-            "name": "Approve Line",
+            "name": "Approve Line" if len(self) == 1 else "Approve Lines",
             "res_model": "approval.move.wizard",
             "view_mode": "form",
             "target": "new",
             "context": {
-                "active_line_id": self.id,
+                "active_line_ids": self.ids,
                 "action_type": "approve",
             }
         }
@@ -208,25 +178,40 @@ class RepairApprovalLine(models.Model):
     def open_reject_wizard(self):
         return {
             "type": "ir.actions.act_window",
-            "name": "Reject Line",
+            "name": "Reject Line" if len(self) == 1 else "Reject Lines",
             "res_model": "approval.move.wizard",
             "view_mode": "form",
             "target": "new",
             "context": {
-                "active_line_id": self.id,
+                "active_line_ids": self.ids,
                 "action_type": "reject",
             }
         }
 
-    def write(self, vals):
-        user = self.env.user
+    # ===========================
+    #   PENDING ACTIVITIES
+    # ===========================
+    def _close_pending_activities(self):
+        """Drop the approval requests of these lines (legacy unlinked ones per repair order)."""
+        repairs = self.repair_id
+        still_waiting = self.search([
+            ("repair_id", "in", repairs.ids),
+            ("approve_state", "=", "waiting"),
+        ]).repair_id
+
+        self.env["mail.activity"]._unlink_system_activities([
+            ("res_model", "=", "repair.order"),
+            ("summary", "=", "Approval Request Sent"),
+            "|",
+            ("approval_line_id", "in", self.ids),
+            "&",
+            ("approval_line_id", "=", False),
+            ("res_id", "in", (repairs - still_waiting).ids),
+        ])
 
+    def write(self, vals):
         # 👈 لو المستخدم من sales team نسمح بالكتابة عادي
-        if (
-                user.has_group('sales_team.group_sale_salesman') or
-                user.has_group('sales_team.group_sale_salesman_all_leads') or
-                user.has_group('sales_team.group_sale_manager')
-        ):
+        if self.env.user._can_act_as_sales():
             return super().write(vals)
 
         # 🚫 باقي المستخدمين
@@ -271,31 +256,42 @@ class ApprovalMoveWizard(models.TransientModel):
         res = super().default_get(fields_list)
 
         action = self.env.context.get("action_type")
+        count = len(self._get_lines())
+        target = "this line" if count <= 1 else f"these {count} lines"
         if action == "approve":
-            res["confirm_text"] = "Are you sure you want to APPROVE this line?"
+            res["confirm_text"] = f"Are you sure you want to APPROVE {target}?"
         else:
-            res["confirm_text"] = "Are you sure you want to REJECT this line?"
+            res["confirm_text"] = f"Are you sure you want to REJECT {target}?"
 
         return res
 
+    @api.model
+    def _get_lines(self):
+        ctx = self.env.context
+        ids = ctx.get("active_line_ids") or ([ctx["active_line_id"]] if ctx.get("active_line_id") else [])
+        return self.env["repair.approval.line"].browse(ids).exists()
+
+    @instrumented("repair_approval.approval_wizard_confirm", records=lambda wizard: len(wizard._get_lines()))
     def action_confirm(self):
-        line_id = self.env.context.get("active_line_id")
         action = self.env.context.get("action_type")
 
-        line = self.env["repair.approval.line"].browse(line_id)
+        lines = self._get_lines()
 
-        if not line:
+        if not lines:
             raise ValidationError("Approval Line not found.")
 
+        # already approved lines have their part line: never process them twice
+        lines = lines.filtered(lambda l: l.approve_state != "approved")
+
         # تنفيذ العملية
         if action == "approve":
-            line.approve_state = "approved"
+            lines.write({"approve_state": "approved"})
 
             # ================
-            #  ⬇ CREATE REAL PART LINE IN REPAIR ORDER
+            #  ⬇ CREATE REAL PART LINES IN REPAIR ORDERS (one batch)
             # ================
             Move = self.env["stock.move"].with_context(from_backend=True)
-            Move.create({
+            Move.create([{
                 "repair_id": line.repair_id.id,
                 "repair_line_type": line.repair_line_type,
                 "product_id": line.product_id.id,
@@ -306,13 +302,15 @@ class ApprovalMoveWizard(models.TransientModel):
                 "location_id": line.repair_id.location_id.id,
                 "location_dest_id": line.repair_id.location_dest_id.id,
                 "partner_id": line.repair_id.partner_id.id,
-            })
+            } for line in lines])
 
 
         # 3) Delete approval line (روح الوسيط انتهى)
         # line.unlink()
         else:
-            line.approve_state = "rejected"
+            lines.write({"approve_state": "rejected"})
+
+        lines._close_pending_activities()
 
         return {"type": "ir.actions.act_window_close"}
 
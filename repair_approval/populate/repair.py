@@ -0,0 +1,63 @@
+import logging
+import random
+
+from odoo import models, api
+
+_logger = logging.getLogger(__name__)
+
+
+class RepairOrder(models.Model):
+    _inherit = "repair.order"
+
+    @api.model
+    def _populate_approval_seed(self, repair_count=50, max_lines=8):
+        """Seed repair orders with approval lines in every state.
+
+        ``odoo-bin populate --factors`` (Odoo 18) multiplies existing
+        records: run this once, then populate ``repair.order`` and
+        ``repair.approval.line``. About 10% of the repairs are cancelled
+        through the cancel wizard (with its reason trail); the others get
+        their approval lines.
+        """
+        rng = random.Random("repair_approval")
+        partner_ids = self.env["res.partner"].search([], limit=1000).ids
+        products = self.env["product.product"].search([("type", "=", "consu")], limit=1000)
+        if not partner_ids or not products:
+            _logger.warning("No partners or goods: no repair orders generated")
+            return self.browse()
+
+        repairs = self.create([{
+            "partner_id": rng.choice(partner_ids),
+            "product_id": rng.choice(products).id,
+            "product_qty": rng.randint(1, 3),
+        } for _i in range(repair_count)])
+
+        users = self.env["res.users"].search([("share", "=", False)])
+        to_cancel = repairs.filtered(lambda r: rng.random() < 0.1)
+        for repair in to_cancel:
+            repair.confirmed_by_id = rng.choice(users).id
+            self.env["repair.cancel.wizard"].create({
+                "repair_id": repair.id,
+                "reason": "Populated cancellation.",
+            }).action_confirm_cancel()
+        _logger.info("Cancelled %s repair orders", len(to_cancel))
+
+        line_vals_list = []
+        for repair in repairs - to_cancel:
+            for part in rng.choices(products, k=rng.randint(0, max_lines)):
+                quantity = rng.randint(1, 5)
+                line_vals_list.append({
+                    "repair_id": repair.id,
+                    "repair_line_type": rng.choices(["add", "remove", "other"], [0.8, 0.15, 0.05])[0],
+                    "product_id": part.id,
+                    "product_uom": part.uom_id.id,
+                    "product_uom_qty": quantity,
+                    "quantity": quantity,
+                    "approve_state": rng.choices(
+                        ["draft", "waiting", "approved", "rejected"], [0.3, 0.3, 0.25, 0.15]
+                    )[0],
+                })
+        lines = self.env["repair.approval.line"].create(line_vals_list)
+        _logger.info("Created %s repair orders with %s approval lines", len(repairs), len(lines))
+
+        return repairs
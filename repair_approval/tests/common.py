@@ -0,0 +1,160 @@
+import logging
+import time
+
+from odoo.tests import new_test_user
+
+_logger = logging.getLogger(__name__)
+
+# Queries one more record may cost at most. This is the core ORM work per
+# created record (sequence numbers, ...): a per-record lookup in the flow
+# under test (picking type, tag, kit, access check, ...) goes over these
+# budgets.
+MAX_QUERIES_PER_MOVE = 4        # Repair Order generated from a receipt move
+MAX_QUERIES_PER_SPARE_LINE = 1  # kit spare part of such a Repair Order
+MAX_QUERIES_PER_LINE = 4        # approval line
+MAX_QUERIES_PER_PART = 3        # repair part (stock.move)
+
+# Queries a flow may differ by from the plain creates it wraps (cache and
+# prefetch noise), whatever the number of records
+MAX_GROWTH_SLACK = 2
+
+# Sales team sizes of the activity fan-out checks, and the queries a flow
+# may add on top of creating the same activities directly
+SALES_TEAM_SIZES = (1, 5, 20)
+MAX_ACTIVITY_OVERHEAD = 15
+
+
+class QueryScalingMixin:
+    """Query-count / latency harness of the performance suites.
+
+    Used with ``TransactionCase`` by the repair_approval and
+    component_receiving suites. Each flow runs at several sizes after a
+    warm-up run (registry caches filled); the query count of the smallest
+    size is the baseline and larger sizes run under
+    ``assertQueryCount(baseline + budget * extra records)``. A scaling
+    table is logged per flow.
+    """
+
+    def _measure(self, func):
+        """Return ``(queries, seconds)`` spent by ``func``, flush included."""
+        self.env.flush_all()
+        self.env.invalidate_all()
+        queries = self.env.cr.sql_log_count
+        start = time.perf_counter()
+        func()
+        self.env.flush_all()
+        return self.env.cr.sql_log_count - queries, time.perf_counter() - start
+
+    def _assert_scaling(self, title, run, sizes, per_unit_budget):
+        """Run ``run(size)`` for every size and check the per-unit query growth.
+
+        ``run(size)`` returns a callable doing the measured work on fresh
+        data of that size (data creation is not measured).
+        """
+        run(sizes[0])()  # warm-up: registry caches, tags, sequences
+
+        rows = []
+        baseline = None
+        for size in sizes:
+            work = run(size)
+            if baseline is None:
+                queries, seconds = self._measure(work)
+                baseline = queries
+            else:
+                with self.assertQueryCount(baseline + int(per_unit_budget * (size - sizes[0]))):
+                    queries, seconds = self._measure(work)
+            rows.append((size, queries, seconds))
+
+        self._log_scaling_table(title, rows)
+        return rows
+
+    def _assert_scaling_like(self, title, run, reference, sizes):
+        """Check that ``run(size)`` grows exactly like ``reference(size)``.
+
+        ``reference(size)`` returns a callable doing the plain ORM work the
+        flow cannot avoid (its batched creates) on fresh data. Whatever a
+        created record costs, a per-record query added by the flow (a
+        lookup per move, ...) makes it grow faster and fails the check.
+        """
+        run(sizes[0])()  # warm-up
+        reference(sizes[0])()
+
+        rows = []
+        overhead = None
+        for size in sizes:
+            plain, _seconds = self._measure(reference(size))
+            work = run(size)
+            if overhead is None:
+                queries, seconds = self._measure(work)
+                overhead = queries - plain
+            else:
+                with self.assertQueryCount(plain + overhead + MAX_GROWTH_SLACK):
+                    queries, seconds = self._measure(work)
+            rows.append((size, queries, seconds))
+
+        self._log_scaling_table(title, rows)
+        return rows
+
+    def _log_scaling_table(self, title, rows):
+        lines = [f"{'size':>8} | {'queries':>8} | {'q/unit':>7} | {'ms':>9}"]
+        for size, queries, seconds in rows:
+            lines.append(f"{size:>8} | {queries:>8} | {queries / max(size, 1):>7.2f} | {seconds * 1000:>9.1f}")
+        _logger.info("%s\n%s", title, "\n".join(lines))
+
+    # =====================================================
+    # Activity fan-out
+    # =====================================================
+    def _ensure_sales_team(self, size, login_prefix):
+        """Make sure ``size`` test sales users named ``login_prefix*`` exist."""
+        existing = self.env["res.users"].search_count([("login", "=like", f"{login_prefix}%")])
+        for index in range(existing, size):
+            new_test_user(
+                self.env, login=f"{login_prefix}{index}",
+                groups="base.group_user,sales_team.group_sale_salesman",
+            )
+        return self.env["res.users"]._get_sales_recipients()
+
+    def _assert_fan_out_scaling(self, title, run, sizes=SALES_TEAM_SIZES):
+        """Check a flow creating one activity per sales user, for every team size.
+
+        ``run(users)`` prepares fresh data and returns ``(reference_vals_list,
+        work, domain)``: the activities ``work`` must create, and the domain
+        matching them once it ran. Creating an activity notifies its user, a
+        core cost per activity, so the reference is ``reference_vals_list``
+        created directly with one ``mail.activity`` batch: ``work`` may only
+        add ``MAX_ACTIVITY_OVERHEAD`` queries to it.
+        """
+        Activity = self.env["mail.activity"]
+        rows = []
+        for size in sizes:
+            with self.subTest(team_size=size):
+                users = self._ensure_sales_team(size, "bench_team_")
+                run(users)[1]()  # warm-up
+
+                reference_vals_list, work, domain = run(users)
+                reference, _seconds = self._measure(lambda: Activity.create(reference_vals_list))
+                with self.assertQueryCount(reference + MAX_ACTIVITY_OVERHEAD):
+                    queries, seconds = self._measure(work)
+
+                self.assertEqual(Activity.search_count(domain), len(reference_vals_list))
+                rows.append((len(users), queries, seconds))
+
+        self._log_scaling_table(f"{title} (size = sales users)", rows)
+        return rows
+
+    # =====================================================
+    # Index usage
+    # =====================================================
+    def _assert_uses_index(self, query, index_name=None):
+        """Check that ``query`` is planned without a sequential scan.
+
+        Sequential scans are disabled so the planner picks an index whenever
+        one applies, whatever the table size (``SET LOCAL`` is undone with
+        the test savepoint).
+        """
+        self.env.cr.execute("SET LOCAL enable_seqscan = off")
+        self.env.cr.execute(f"EXPLAIN {query}")
+        plan = "\n".join(row[0] for row in self.env.cr.fetchall())
+        self.assertNotIn("Seq Scan", plan, f"No index used by: {query}")
+        if index_name:
+            self.assertIn(index_name, plan)
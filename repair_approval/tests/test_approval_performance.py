@@ -0,0 +1,248 @@
+from odoo.exceptions import ValidationError
+from odoo.tests import TransactionCase, new_test_user, tagged
+
+from .common import MAX_QUERIES_PER_LINE, MAX_QUERIES_PER_PART, QueryScalingMixin
+
+# Approval lines per operation, parts per cancelled repair
+LINE_COUNTS = (1, 50, 200)
+GUARD_LINE_COUNTS = (1, 100, 1000)
+PART_COUNTS = (0, 10, 50)
+
+
+@tagged("post_install", "-at_install")
+class TestApprovalPerformance(QueryScalingMixin, TransactionCase):
+    """Latency and query-count ceilings of the approval and cancellation flows."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.env = cls.env(context=dict(cls.env.context, tracking_disable=True))
+        cls.env["ir.config_parameter"].sudo().set_param("repair_approval.perf_instrumentation", False)
+
+        cls.partner = cls.env["res.partner"].create({"name": "Approval Benchmark Customer"})
+        cls.unit = cls.env["product.product"].create({"name": "Benchmark Unit", "type": "consu"})
+        cls.part = cls.env["product.product"].create({"name": "Benchmark Part", "type": "consu"})
+
+        cls.sales_user = new_test_user(
+            cls.env, login="approval_bench_sales",
+            groups="base.group_user,stock.group_stock_user,sales_team.group_sale_salesman",
+        )
+        cls.technician = new_test_user(
+            cls.env, login="approval_bench_tech",
+            groups="base.group_user,stock.group_stock_user",
+        )
+
+    # =====================================================
+    # Helpers
+    # =====================================================
+    def _create_repair(self, **vals):
+        return self.env["repair.order"].create({
+            "product_id": self.unit.id,
+            "partner_id": self.partner.id,
+            **vals,
+        })
+
+    def _create_lines(self, count, approve_state="draft", repair=None):
+        repair = repair or self._create_repair()
+        return self.env["repair.approval.line"].create([{
+            "repair_id": repair.id,
+            "repair_line_type": "add",
+            "product_id": self.part.id,
+            "product_uom": self.part.uom_id.id,
+            "product_uom_qty": 1.0,
+            "quantity": 1.0,
+            "approve_state": approve_state,
+        } for _i in range(count)])
+
+    def _part_vals(self, repair, count):
+        return [{
+            "repair_id": repair.id,
+            "repair_line_type": "add",
+            "product_id": self.part.id,
+            "product_uom": self.part.uom_id.id,
+            "product_uom_qty": 1.0,
+            "location_id": repair.location_id.id,
+            "location_dest_id": repair.location_dest_id.id,
+            "company_id": repair.company_id.id,
+        } for _i in range(count)]
+
+    # =====================================================
+    # action_send_request fan-out
+    # =====================================================
+    def test_send_request_fan_out(self):
+        """Sending only adds a constant overhead to the activities it creates."""
+        model_id = self.env["ir.model"]._get_id("repair.order")
+        activity_type_id = self.env.ref("mail.mail_activity_data_todo").id
+
+        def run(users):
+            reference_vals_list = [{
+                "res_id": line.repair_id.id,
+                "res_model_id": model_id,
+                "activity_type_id": activity_type_id,
+                "user_id": user.id,
+                "approval_line_id": line.id,
+                "summary": "Approval Request Sent",
+                "note": line.product_id.display_name,
+            } for line in self._create_lines(10) for user in users]
+            lines = self._create_lines(10).with_user(self.technician)
+            return reference_vals_list, lines.action_send_request, [("approval_line_id", "in", lines.ids)]
+
+        self._assert_fan_out_scaling("action_send_request, 10 lines", run)
+
+    def test_send_request_again_does_not_duplicate(self):
+        """A second request refreshes the open activities instead of adding new ones."""
+        lines = self._create_lines(50).with_user(self.technician)
+        lines.action_send_request()
+        activities = self.env["mail.activity"].search([("approval_line_id", "in", lines.ids)])
+
+        def run(size):
+            return lines[:size].action_send_request
+
+        self._assert_scaling("action_send_request (resend, size = lines)", run, (1, 10, 50), MAX_QUERIES_PER_LINE)
+
+        self.assertEqual(
+            self.env["mail.activity"].search([("approval_line_id", "in", lines.ids)]),
+            activities,
+        )
+
+    # =====================================================
+    # ApprovalMoveWizard approve / reject
+    # =====================================================
+    def _run_wizard(self, action_type, size):
+        lines = self._create_lines(size, approve_state="waiting")
+        wizard = self.env["approval.move.wizard"].with_user(self.sales_user).with_context(
+            active_line_ids=lines.ids,
+            action_type=action_type,
+        ).create({})
+        return wizard.action_confirm
+
+    def test_approve_wizard_scaling(self):
+        self._assert_scaling(
+            "ApprovalMoveWizard approve (size = lines)",
+            lambda size: self._run_wizard("approve", size),
+            LINE_COUNTS, MAX_QUERIES_PER_LINE,
+        )
+
+    def test_reject_wizard_scaling(self):
+        self._assert_scaling(
+            "ApprovalMoveWizard reject (size = lines)",
+            lambda size: self._run_wizard("reject", size),
+            LINE_COUNTS, MAX_QUERIES_PER_LINE,
+        )
+
+    def test_approve_wizard_creates_parts_once(self):
+        lines = self._create_lines(5, approve_state="waiting")
+        lines[:2].with_user(self.sales_user).write({"approve_state": "approved"})
+        repair = lines.repair_id
+        parts_before = len(repair.move_ids)
+
+        self.env["approval.move.wizard"].with_user(self.sales_user).with_context(
+            active_line_ids=lines.ids,
+            action_type="approve",
+        ).create({}).action_confirm()
+
+        self.assertEqual(len(repair.move_ids) - parts_before, 3)
+        self.assertEqual(set(lines.mapped("approve_state")), {"approved"})
+
+    # =====================================================
+    # RepairApprovalLine.write guard
+    # =====================================================
+    def test_write_guard_scaling(self):
+        """The guard costs the same for 1 or 1000 lines (one cached capability check)."""
+        for user in (self.sales_user, self.technician):
+            with self.subTest(user=user.login):
+                def run(size, user=user):
+                    lines = self._create_lines(size).with_user(user)
+                    return lambda: lines.write({"product_uom_qty": 2.0})
+
+                self._assert_scaling(
+                    f"RepairApprovalLine.write guard as {user.login} (size = lines)",
+                    run, GUARD_LINE_COUNTS, 0.01,
+                )
+
+    def test_write_guard_blocks_non_sales(self):
+        for state in ("waiting", "approved", "rejected"):
+            with self.subTest(state=state):
+                lines = self._create_lines(100, approve_state=state)
+                with self.assertRaises(ValidationError):
+                    lines.with_user(self.technician).write({"product_uom_qty": 2.0})
+                lines.with_user(self.sales_user).write({"product_uom_qty": 2.0})
+
+    # =====================================================
+    # StockMove.create sales guard
+    # =====================================================
+    def test_stock_move_guard_scaling(self):
+        Move = self.env["stock.move"].with_user(self.sales_user)
+
+        def run(size):
+            repair = self._create_repair()
+            return lambda: Move.create(self._part_vals(repair, size))
+
+        self._assert_scaling(
+            "StockMove.create sales guard (size = parts)",
+            run, LINE_COUNTS, MAX_QUERIES_PER_PART,
+        )
+
+    def test_stock_move_guard_blocks_non_sales(self):
+        repair = self._create_repair()
+        with self.assertRaises(ValidationError):
+            self.env["stock.move"].with_user(self.technician).create(self._part_vals(repair, 50))
+
+        moves = self.env["stock.move"].with_user(self.technician).with_context(
+            from_backend=True,
+        ).create(self._part_vals(repair, 50))
+        self.assertEqual(len(moves), 50)
+
+    # =====================================================
+    # RepairCancelWizard
+    # =====================================================
+    def test_cancel_wizard_scaling(self):
+        Move = self.env["stock.move"].with_context(from_backend=True)
+
+        def run(size):
+            repair = self._create_repair(confirmed_by_id=self.sales_user.id)
+            Move.create(self._part_vals(repair, size))
+            wizard = self.env["repair.cancel.wizard"].create({
+                "repair_id": repair.id,
+                "reason": "Customer withdrew the unit.",
+            })
+            return wizard.action_confirm_cancel
+
+        self._assert_scaling(
+            "RepairCancelWizard (size = parts on the repair)",
+            run, PART_COUNTS, MAX_QUERIES_PER_PART,
+        )
+
+    # =====================================================
+    # Indexes used by the approval queues
+    # =====================================================
+    def test_approval_lines_use_indexes(self):
+        repair = self._create_lines(1).repair_id
+        for query in (
+            f"SELECT id FROM repair_approval_line WHERE repair_id = {repair.id}",
+            "SELECT id FROM repair_approval_line WHERE approve_state = 'approved'",
+        ):
+            with self.subTest(query=query):
+                self._assert_uses_index(query)
+
+        self._assert_uses_index(
+            f"SELECT id FROM repair_approval_line WHERE repair_id = {repair.id} AND approve_state = 'waiting'",
+            "repair_approval_line_waiting_index",
+        )
+
+    # =====================================================
+    # Instrumentation switch
+    # =====================================================
+    def test_instrumentation_switch(self):
+        Sample = self.env["repair.approval.perf.sample"]
+        lines = self._create_lines(3)
+
+        lines.action_send_request()
+        self.assertFalse(Sample.search([("entry_point", "=", "repair_approval.send_request")]))
+
+        self.env["ir.config_parameter"].sudo().set_param("repair_approval.perf_instrumentation", True)
+        lines.action_send_request()
+        sample = Sample.search([("entry_point", "=", "repair_approval.send_request")])
+        self.assertEqual(len(sample), 1)
+        self.assertEqual(sample.record_count, 3)
+        self.assertGreater(sample.query_count, 0)